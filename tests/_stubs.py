@@ -7,7 +7,18 @@ import types
 from typing import Optional
 
 
-class _DummyPacket:
+class _DummyPacketMeta(type):
+    """Expose ``fields_desc`` entries as class attributes, as scapy does."""
+
+    def __new__(mcs, name, bases, namespace):
+        for field in namespace.get("fields_desc", ()):
+            namespace.setdefault(field.name, field)
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class _DummyPacket(metaclass=_DummyPacketMeta):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         pass
 
@@ -16,6 +27,8 @@ class _DummyPacket:
 
 
 class _DummyField:
+    __slots__ = ("name",)
+
     def __init__(self, *args, **kwargs):
         self.name = kwargs.get("name")
         if not self.name and args:
@@ -23,53 +36,51 @@ class _DummyField:
 
 
 class _DummyFloatField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyBitField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyByteField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyShortField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyLEShortField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyIntField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyLongField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyDoubleField(_DummyField):
-    pass
+    __slots__ = ()
 
 
 class _DummyStrField(_DummyField):
+    __slots__ = ("_length",)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        length = 0
-        if args:
-            last = args[-1]
-            if isinstance(last, int):
-                length = last
-        length = kwargs.get("length", length)
-        self._length = length
+        # ``length`` is expected as a keyword; the positional form is kept
+        # only for callers that still pass it as the third argument.
+        self._length = args[2] if len(args) > 2 else kwargs.get("length", 0)
 
     def length_from(self, packet):
         return self._length
 
 
-scapy_all_stub = types.SimpleNamespace(
+SCAPY_ALL_STUB = types.SimpleNamespace(
     Packet=_DummyPacket,
     IEEEFloatField=_DummyFloatField,
     BitField=_DummyBitField,
@@ -89,8 +100,12 @@ scapy_all_stub = types.SimpleNamespace(
 def install_common_stubs() -> None:
     """Install light-weight stand-ins for optional third-party packages."""
 
+    if getattr(sys.modules.get("scapy"), "_xcip_stub", False):
+        return
+
     scapy_stub = types.ModuleType("scapy")
-    scapy_stub.all = scapy_all_stub
+    scapy_stub.all = SCAPY_ALL_STUB
+    scapy_stub._xcip_stub = True
     sys.modules["scapy"] = scapy_stub
 
     pyfiglet_stub = types.ModuleType("pyfiglet")
@@ -103,14 +118,30 @@ def install_common_stubs() -> None:
 
     tabulate_stub = types.ModuleType("tabulate")
     tabulate_stub.tabulate = lambda data, headers=None, tablefmt=None, colalign=None: "\n".join(
-        ["\t".join(map(str, row)) for row in data]
+        "\t".join(map(str, row)) for row in data
     )
     sys.modules.setdefault("tabulate", tabulate_stub)
 
 
+class _NullLock:
+    """Lock-compatible no-op for single-threaded test doubles."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def acquire(self, *args, **kwargs):
+        return True
+
+    def release(self):
+        pass
+
+
 class _StubCommunicationManager:
     def __init__(self, *args, **kwargs):
-        self.lock = threading.Lock()
+        self.lock = _NullLock()
         self.enable_auto_reconnect = False
         self.start_comm_thread_instance: Optional[threading.Thread] = None
 
@@ -128,6 +159,7 @@ def install_comm_stub():
     comm_stub.CommunicationManager = _StubCommunicationManager
     comm_stub.default_client_factory = lambda **kwargs: None
     comm_stub.default_thread_factory = lambda **kwargs: None
+    comm_stub._xcip_stub = True
     sys.modules.setdefault("xcipmaster.comm", comm_stub)
     return comm_stub
 
@@ -135,9 +167,10 @@ def install_comm_stub():
 __all__ = [
     "install_common_stubs",
     "install_comm_stub",
-    "scapy_all_stub",
+    "SCAPY_ALL_STUB",
     "_DummyPacket",
     "_DummyField",
     "_DummyFloatField",
     "_DummyStrField",
+    "_NullLock",
 ]
@@ -1,14 +1,53 @@
 """Shared pytest configuration for the test suite."""
 from __future__ import annotations
 
+import logging
 import sys
 from pathlib import Path
 
-from ._stubs import install_comm_stub, install_common_stubs
+import pytest
+from click.testing import CliRunner
 
-install_common_stubs()
-install_comm_stub()
+from ._stubs import install_comm_stub, install_common_stubs
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
+
+
+def pytest_configure(config):
+    """Install the third-party stubs once, before any test module is collected."""
+
+    install_common_stubs()
+    install_comm_stub()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_root_logger():
+    """Keep informational log records from reaching the root handlers."""
+
+    root = logging.getLogger()
+    previous_level = root.level
+    root.setLevel(logging.WARNING)
+    yield
+    root.setLevel(previous_level)
+
+
+@pytest.fixture(scope="session")
+def config_service():
+    """Load the default CIP configuration once for the whole test session."""
+
+    from xcipmaster.config import CIPConfigService
+    from xcipmaster.paths import default_config_file
+
+    service = CIPConfigService()
+    result = service.load_configuration(str(default_config_file()))
+    assert result.success, "Fixture failed to load CIP configuration"
+    return service
+
+
+@pytest.fixture(scope="session")
+def cli_runner():
+    """Share a click test runner; ``invoke`` keeps no state between calls."""
+
+    return CliRunner()
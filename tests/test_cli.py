@@ -1,27 +1,16 @@
-import sys
+import logging
+import os
 from pathlib import Path
-import threading
+import types
 
 import click
 import pytest
-from click.testing import CliRunner
 
-from tests._stubs import install_comm_stub, install_common_stubs
-
-install_common_stubs()
-install_comm_stub()
-
-BASE_DIR = Path(__file__).resolve().parent.parent
-if str(BASE_DIR) not in sys.path:
-    sys.path.insert(0, str(BASE_DIR))
-
-import xcipmaster.cli.commands as cli_commands
-import xcipmaster.cli.controller as cli_controller
-from xcipmaster.cli.commands import _initialize_controller, cli
-from xcipmaster.cli.controller import CLI
 from xcipmaster.config import CIPConfigResult
 from xcipmaster.network import NetworkTestResult
 
+from tests._stubs import _NullLock
+
 
 class FakeConfigService:
     def __init__(self):
@@ -68,7 +57,7 @@ class FakeNetworkService:
 class FakeCommManager:
     def __init__(self):
         self.enable_auto_reconnect = False
-        self.lock = threading.Lock()
+        self.lock = _NullLock()
         self.started = False
         self.stopped = False
         self._thread = None
@@ -84,6 +73,36 @@ class FakeCommManager:
         return self._thread
 
 
+@pytest.fixture(scope="module")
+def cli_bits():
+    """Import the CLI modules only when a test in this module needs them."""
+
+    import xcipmaster.cli.commands as cli_commands
+    from xcipmaster.cli.controller import CLI, configure_logging
+
+    return types.SimpleNamespace(
+        commands=cli_commands,
+        cli=cli_commands.cli,
+        initialize_controller=cli_commands._initialize_controller,
+        CLI=CLI,
+        configure_logging=configure_logging,
+    )
+
+
+@pytest.fixture
+def fake_config():
+    return FakeConfigService()
+
+
+@pytest.fixture
+def fake_network():
+    return FakeNetworkService()
+
+
+@pytest.fixture
+def fake_comm():
+    return FakeCommManager()
+
 
 class RecordingFieldMutator:
     def __init__(self):
@@ -94,6 +113,11 @@ class RecordingFieldMutator:
         self.set_calls.append((packet, field_name, value))
         return value
 
+    def set_values(self, packet, updates):
+        for field_name, value in updates.items():
+            self.set_value(packet, field_name, value)
+        return dict(updates)
+
     def clear_value(self, packet, field_name):
         self.clear_calls.append((packet, field_name))
         return None
@@ -149,13 +173,15 @@ def _packet_with_field(field_name):
     return packet_cls()
 
 
-def _make_controller_with_stubs(*, field_mutator=None, field_formatter=None, wave_manager=None):
+def _make_controller_with_stubs(
+    cli_bits, *, field_mutator=None, field_formatter=None, wave_manager=None
+):
     fake_config = FakeConfigService()
     fake_network = FakeNetworkService()
     fake_comm = FakeCommManager()
     packet = _packet_with_field("example")
     fake_config.set_packet_instance("OT_EO", packet)
-    controller = CLI(
+    controller = cli_bits.CLI(
         config_service=fake_config,
         network_service=fake_network,
         comm_manager=fake_comm,
@@ -166,17 +192,19 @@ def _make_controller_with_stubs(*, field_mutator=None, field_formatter=None, wav
 )
     return controller, packet
 
-def test_initialize_controller_skips_interactive_side_effects(monkeypatch):
+def test_initialize_controller_skips_interactive_side_effects(
+    monkeypatch, cli_bits, fake_config, fake_network, fake_comm
+):
     def fail_confirm(*args, **kwargs):  # pragma: no cover - defensive
         pytest.fail("click.confirm should not be called in test mode")
 
-    monkeypatch.setattr(cli_commands.click, "confirm", fail_confirm)
+    monkeypatch.setattr(cli_bits.commands.click, "confirm", fail_confirm)
 
-    def factory() -> CLI:
-        controller = CLI(
-            config_service=FakeConfigService(),
-            network_service=FakeNetworkService(),
-            comm_manager=FakeCommManager(),
+    def factory():
+        controller = cli_bits.CLI(
+            config_service=fake_config,
+            network_service=fake_network,
+            comm_manager=fake_comm,
             test_mode=True,
         )
 
@@ -194,29 +222,25 @@ def test_initialize_controller_skips_interactive_side_effects(monkeypatch):
         )
         return controller
 
-    ctx = click.Context(cli, info_name="cli")
+    ctx = click.Context(cli_bits.cli, info_name="cli")
     ctx.resilient_parsing = False
-    controller = _initialize_controller(ctx, factory)
+    controller = cli_bits.initialize_controller(ctx, factory)
 
     assert controller.test_mode is True
 
 
-def test_start_command_uses_stubbed_services(monkeypatch):
-    fake_config = FakeConfigService()
-    fake_network = FakeNetworkService()
-    fake_comm = FakeCommManager()
-
-    controller = CLI(
+def test_start_command_uses_stubbed_services(
+    cli_runner, cli_bits, fake_config, fake_network, fake_comm
+):
+    controller = cli_bits.CLI(
         config_service=fake_config,
         network_service=fake_network,
         comm_manager=fake_comm,
         test_mode=True,
+        clock=types.SimpleNamespace(sleep=lambda *args, **kwargs: None),
     )
 
-    monkeypatch.setattr(cli_controller.time, "sleep", lambda *args, **kwargs: None)
-
-    runner = CliRunner()
-    result = runner.invoke(cli, ["start"], obj=controller)
+    result = cli_runner.invoke(cli_bits.cli, ["start"], obj=controller)
 
     assert result.exit_code == 0
     assert fake_config.load_calls, "CIP configuration should be invoked"
@@ -224,34 +248,81 @@ def test_start_command_uses_stubbed_services(monkeypatch):
     assert fake_comm.started is True
 
 
-def test_set_field_delegates_to_mutator():
+def test_set_field_delegates_to_mutator(cli_bits):
     mutator = RecordingFieldMutator()
-    controller, packet = _make_controller_with_stubs(field_mutator=mutator)
+    controller, packet = _make_controller_with_stubs(cli_bits, field_mutator=mutator)
     result = controller.set_field("example", "value")
     assert result is True
     assert mutator.set_calls == [(packet, "example", "value")]
 
 
-def test_clear_field_delegates_to_mutator():
+def test_set_fields_checks_every_name_before_changing_anything(capsys, cli_bits):
     mutator = RecordingFieldMutator()
-    controller, packet = _make_controller_with_stubs(field_mutator=mutator)
+    manager = FakeWaveformManager()
+    controller, _ = _make_controller_with_stubs(
+        cli_bits, field_mutator=mutator, wave_manager=manager
+    )
+    controller.config_service.TO_packet = None
+    manager.active.add("example")
+
+    assert controller.set_fields({"example": "1", "typo": "2"}) is False
+    assert "Field typo not found." in capsys.readouterr().out
+    assert manager.active == {"example"}
+    assert mutator.set_calls == []
+
+
+def test_set_command_applies_extra_pairs_as_one_batch(cli_runner, cli_bits):
+    mutator = RecordingFieldMutator()
+    controller, packet = _make_controller_with_stubs(cli_bits, field_mutator=mutator)
+    packet.__class__.other = 0
+    controller.ensure_configuration = lambda *a, **k: True
+
+    result = cli_runner.invoke(
+        cli_bits.cli, ["set", "example", "1", "other", "2"], obj=controller
+    )
+
+    assert result.exit_code == 0, result.output
+    assert mutator.set_calls == [(packet, "example", "1"), (packet, "other", "2")]
+
+    result = cli_runner.invoke(cli_bits.cli, ["set", "example", "1", "other"], obj=controller)
+    assert result.exit_code != 0
+
+
+def test_clear_field_delegates_to_mutator(cli_bits):
+    mutator = RecordingFieldMutator()
+    controller, packet = _make_controller_with_stubs(cli_bits, field_mutator=mutator)
     result = controller.clear_field("example")
     assert result is True
     assert mutator.clear_calls == [(packet, "example")]
 
 
-def test_get_field_uses_formatter(capsys):
+def test_get_field_uses_formatter(capsys, cli_bits):
     formatter = RecordingFieldFormatter({"example": "formatted"})
-    controller, packet = _make_controller_with_stubs(field_formatter=formatter)
+    controller, packet = _make_controller_with_stubs(cli_bits, field_formatter=formatter)
     controller.get_field("example")
     assert formatter.calls == [(packet, "example")]
     output = capsys.readouterr().out
     assert "formatted" in output
 
 
-def test_wave_methods_delegate_to_manager(capsys):
+def test_help_menu_lists_network_commands_only_when_enabled(capsys, cli_bits):
+    controller, _packet = _make_controller_with_stubs(cli_bits)
+
+    controller.help_menu(network_commands=False)
+    output = capsys.readouterr().out
+    assert "test-net" not in output
+    assert "set-net" not in output
+    assert "cip-config" in output
+
+    controller.help_menu()
+    output = capsys.readouterr().out
+    assert "test-net" in output
+    assert "set-net" in output
+
+
+def test_wave_methods_delegate_to_manager(capsys, cli_bits):
     manager = FakeWaveformManager()
-    controller, _ = _make_controller_with_stubs(wave_manager=manager)
+    controller, _ = _make_controller_with_stubs(cli_bits, wave_manager=manager)
 
     assert controller.wave_field("example", 5, 1, 100)
     assert manager.wave_calls == [("example", 5, 1, 100)]
@@ -270,3 +341,173 @@ def test_wave_methods_delegate_to_manager(capsys):
     output = capsys.readouterr().out
     assert "second" in output
     assert manager.stop_all_calls == 1
+
+
+def test_initialize_controller_reuses_context_controller(
+    cli_bits, fake_config, fake_network, fake_comm
+):
+    existing = cli_bits.CLI(
+        config_service=fake_config,
+        network_service=fake_network,
+        comm_manager=fake_comm,
+        test_mode=True,
+    )
+
+    def factory():  # pragma: no cover - defensive
+        pytest.fail("factory should not be called when ctx.obj is set")
+
+    ctx = click.Context(cli_bits.cli, info_name="cli", obj=existing)
+    assert cli_bits.initialize_controller(ctx, factory) is existing
+
+
+def test_configure_logging_adds_one_file_handler(tmp_path, cli_bits):
+    root = logging.getLogger()
+    previous_level = root.level
+    handler = cli_bits.configure_logging(str(tmp_path), logging.INFO)
+    try:
+        assert cli_bits.configure_logging(str(tmp_path), logging.INFO) is handler
+        assert root.handlers.count(handler) == 1
+        assert root.level == logging.INFO
+        assert (tmp_path / "app.log").exists()
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+        root.setLevel(previous_level)
+
+
+def test_ensure_configuration_reloads_only_when_file_changes(
+    tmp_path, cli_bits, fake_config, fake_network, fake_comm
+):
+    config_file = tmp_path / "config.xml"
+    config_file.write_text("<config/>")
+    controller = cli_bits.CLI(
+        config_service=fake_config,
+        network_service=fake_network,
+        comm_manager=fake_comm,
+        test_mode=True,
+        clock=types.SimpleNamespace(sleep=lambda *args, **kwargs: None),
+    )
+
+    assert controller.ensure_configuration(str(config_file))
+    assert controller.ensure_configuration(str(config_file))
+    assert len(fake_config.load_calls) == 1
+
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert controller.ensure_configuration(str(config_file))
+    assert len(fake_config.load_calls) == 2
+
+
+def test_list_files_in_config_folder_rescans_only_when_folder_changes(
+    tmp_path, cli_bits, fake_config, fake_network, fake_comm
+):
+    scans = []
+
+    def list_files(config_folder):
+        scans.append(config_folder)
+        return sorted(Path(config_folder).glob("*.xml"))
+
+    fake_config.list_files_in_config_folder = list_files
+    (tmp_path / "a.xml").write_text("<config/>")
+    controller = cli_bits.CLI(
+        config_service=fake_config,
+        network_service=fake_network,
+        comm_manager=fake_comm,
+        test_mode=True,
+    )
+
+    assert controller.list_files_in_config_folder(str(tmp_path)) == [tmp_path / "a.xml"]
+    assert controller.list_files_in_config_folder(str(tmp_path)) == [tmp_path / "a.xml"]
+    assert len(scans) == 1
+
+    (tmp_path / "b.xml").write_text("<config/>")
+    stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert len(controller.list_files_in_config_folder(str(tmp_path))) == 2
+    assert len(scans) == 2
+
+
+def test_preloaded_configuration_is_reported_without_reloading(
+    capsys, tmp_path, cli_bits, fake_config, fake_network, fake_comm
+):
+    config_file = tmp_path / "config.xml"
+    config_file.write_text("<config/>")
+
+    def load_configuration(config_path):
+        fake_config.load_calls.append(Path(config_path))
+        return CIPConfigResult(resolved_path=Path(config_path), tests=[], success=True)
+
+    fake_config.load_configuration = load_configuration
+    controller = cli_bits.CLI(
+        config_service=fake_config,
+        network_service=fake_network,
+        comm_manager=fake_comm,
+        test_mode=True,
+        clock=types.SimpleNamespace(sleep=lambda *args, **kwargs: None),
+    )
+
+    controller.preload_configuration(str(config_file))
+    assert controller.ensure_configuration(str(config_file))
+
+    assert fake_config.load_calls == [config_file]
+    assert "All tests passed successfully." in capsys.readouterr().out
+
+
+def test_live_field_data_tabulates_packets_only_when_values_change(
+    monkeypatch, capsys, cli_bits
+):
+    import xcipmaster.cli.controller as controller_module
+
+    formatter = RecordingFieldFormatter({"example": "1"})
+    controller, _ = _make_controller_with_stubs(cli_bits, field_formatter=formatter)
+    packet_cls = type(
+        "Packet", (), {"fields_desc": [types.SimpleNamespace(name="example")], "example": 0}
+    )
+    controller.ot_packet = packet_cls()
+    controller.to_packet = packet_cls()
+
+    sleeps = []
+    now = [100.0]
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        # each tick takes 4ms of work on top of the sleep
+        now[0] += seconds + 0.004
+        if len(sleeps) == 2:
+            formatter.values["example"] = "2"
+        elif len(sleeps) == 3:
+            raise KeyboardInterrupt
+
+    controller._clock = types.SimpleNamespace(sleep=sleep, monotonic=lambda: now[0])
+
+    field_tables = []
+    real_tabulate = controller_module.tabulate
+
+    def counting_tabulate(rows, headers=(), **kwargs):
+        if headers == ["Field Name", "Field Value"]:
+            field_tables.append(list(rows))
+        return real_tabulate(rows, headers=headers, **kwargs)
+
+    monkeypatch.setattr(controller_module, "tabulate", counting_tabulate)
+
+    writes = []
+    real_echo = controller_module.click.echo
+
+    def recording_echo(message=None, **kwargs):
+        writes.append(message)
+        real_echo(message, **kwargs)
+
+    monkeypatch.setattr(controller_module.click, "echo", recording_echo)
+
+    controller.live_field_data(10)
+
+    assert field_tables == [[("example", " 1")]] * 2 + [[("example", " 2")]] * 2
+    assert sleeps == [pytest.approx(0.01), pytest.approx(0.006), pytest.approx(0.006)]
+    # one write per tick, each ending with the separator line
+    assert len(writes) == 1 + 3
+    assert all(frame.endswith("\n\n" + controller_module.SEPARATOR_LINE) for frame in writes[1:])
+    output = capsys.readouterr().out
+    assert output.count("example\t 1") == 4
+    assert output.count("example\t 2") == 2
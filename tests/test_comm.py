@@ -1,56 +1,14 @@
+import errno
+import functools
 import logging
+import socket
 import sys
 import types
 from types import SimpleNamespace
 
-class _StubField:
-    def __init__(self, *args, **kwargs):
-        pass
-
-
-class _StubPacket:
-    def __init__(self, *args, **kwargs):
-        pass
-
+import pytest
 
-class _StubFloatField(_StubField):
-    pass
-
-
-class _StubStrField(_StubField):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        length = 0
-        if args:
-            last = args[-1]
-            if isinstance(last, int):
-                length = last
-        length = kwargs.get("length", length)
-        self._length = length
-
-    def length_from(self, _packet):  # pragma: no cover - compatibility shim
-        return self._length
-
-
-class _StubByteField(_StubField):
-    pass
-
-
-scapy_all_stub = types.SimpleNamespace(
-    Packet=_StubPacket,
-    ByteField=_StubByteField,
-    BitField=_StubField,
-    IEEEFloatField=_StubFloatField,
-    StrFixedLenField=_StubStrField,
-    LEIntField=_StubField,
-    ShortField=_StubField,
-    SignedByteField=_StubField,
-    LEShortField=_StubField,
-    IEEEDoubleField=_StubField,
-)
-scapy_stub = types.ModuleType("scapy")
-scapy_stub.all = scapy_all_stub
-sys.modules.setdefault("scapy", scapy_stub)
+from tests._stubs import SCAPY_ALL_STUB as scapy_all_stub
 
 # Provide lightweight stubs for the third-party CIP client implementation so
 # importing :mod:`xcipmaster.comm` does not pull heavy dependencies during the
@@ -86,49 +44,66 @@ scapy_cip_enip_module.tgv2020 = tgv_stub
 sys.modules.setdefault("thirdparty.scapy_cip_enip.tgv2020", tgv_stub)
 
 # Ensure we load the real communication module rather than the CLI test stub.
-sys.modules.pop("xcipmaster.comm", None)
+if getattr(sys.modules.get("xcipmaster.comm"), "_xcip_stub", False):
+    sys.modules.pop("xcipmaster.comm")
 
 from xcipmaster.comm import CommunicationManager
 
+TEST_LOGGER = logging.getLogger("test")
+TEST_LOGGER.addHandler(logging.NullHandler())
+TEST_LOGGER.propagate = False
+
 
 class FakeAssembly:
     def __init__(self, size: int):
         self.attrib = {"size": str(size)}
 
 
+@functools.lru_cache(maxsize=1)
+def _make_ot_packet_class():
+    class _FakeOTPacket:
+        MPU_CTCMSAlive = scapy_all_stub.ByteField("MPU_CTCMSAlive", 0)
+
+        def __init__(self):
+            self.MPU_CTCMSAlive = 0
+            self.MPU_CDateTimeSec = 0
+
+    return _FakeOTPacket
+
+
+@functools.lru_cache(maxsize=1)
+def _make_to_packet_class():
+    class _FakeTOPacket:
+        def __init__(self, payload):
+            self.payload = payload
+
+    return _FakeTOPacket
+
+
 class FakeConfigService:
-    def __init__(self):
+    def __init__(self, *, ot_packet_class=None, to_packet_class=None):
         self.logger = logging.getLogger("FakeConfigService")
         self.ot_eo_assemblies = FakeAssembly(16)
         self.to_assemblies = FakeAssembly(16)
-        self.OT_packet_class = self._make_ot_packet_class()
-        self.TO_packet_class = self._make_to_packet_class()
+        self.OT_packet_class = ot_packet_class or _make_ot_packet_class()
+        self.TO_packet_class = to_packet_class or _make_to_packet_class()
         self.OT_packet = self.OT_packet_class()
         self.TO_packet = None
 
-    @staticmethod
-    def _make_ot_packet_class():
-        class _FakeOTPacket:
-            MPU_CTCMSAlive = scapy_all_stub.ByteField("MPU_CTCMSAlive", 0)
-
-            def __init__(self):
-                self.MPU_CTCMSAlive = 0
-                self.MPU_CDateTimeSec = 0
 
-        return _FakeOTPacket
+class FakeNetworkService:
+    ip_address = "192.0.2.1"
+    user_multicast_address = "239.255.0.1"
 
-    @staticmethod
-    def _make_to_packet_class():
-        class _FakeTOPacket:
-            def __init__(self, payload):
-                self.payload = payload
 
-        return _FakeTOPacket
+@pytest.fixture
+def fake_config_service():
+    return FakeConfigService()
 
 
-class FakeNetworkService:
-    ip_address = "192.0.2.1"
-    user_multicast_address = "239.255.0.1"
+@pytest.fixture
+def fake_network_service():
+    return FakeNetworkService()
 
 
 class FakeClient:
@@ -139,6 +114,7 @@ class FakeClient:
         self.closed = 0
         self.recv_calls = 0
         self.send_calls = []
+        self._recv_queue = iter([SimpleNamespace(payload=SimpleNamespace(load=b"payload")), None])
 
     def forward_open(self):
         self.forward_open_called += 1
@@ -149,20 +125,22 @@ class FakeClient:
 
     def close(self):
         self.closed += 1
+        for attribute in ("Sock", "MulticastSock", "Sock1"):
+            sock = getattr(self, attribute, None)
+            if sock is not None:
+                sock.close()
 
     def recv_UDP_ENIP_CIP_IO(self, *_args, **_kwargs):
         self.recv_calls += 1
-        if self.recv_calls == 1:
-            return SimpleNamespace(payload=SimpleNamespace(load=b"payload"))
-        return None
+        return next(self._recv_queue, None)
 
     def send_UDP_ENIP_CIP_IO(self, **kwargs):
         self.send_calls.append(kwargs)
 
 
-def test_run_once_uses_fake_client_and_stays_synchronous():
-    config = FakeConfigService()
-    network = FakeNetworkService()
+def test_run_once_uses_fake_client_and_stays_synchronous(fake_config_service, fake_network_service):
+    config = fake_config_service
+    network = fake_network_service
     created_clients = []
 
     def fake_client_factory(**kwargs):
@@ -177,7 +155,7 @@ def test_run_once_uses_fake_client_and_stays_synchronous():
     manager = CommunicationManager(
         config,
         network,
-        logger=logging.getLogger("test"),
+        logger=TEST_LOGGER,
         client_factory=fake_client_factory,
         thread_factory=forbidden_thread_factory,
     )
@@ -196,31 +174,22 @@ def test_run_once_uses_fake_client_and_stays_synchronous():
     assert manager.bCIPErrorOccured is True
 
 
-class FakeThread:
+class NullThread:
     def __init__(self, *, target, name=None):
-        self._target = target
+        self.target = target
         self.name = name
-        self._alive = False
         self.started = False
 
     def start(self):
         self.started = True
-        self._alive = True
-        try:
-            self._target()
-        finally:
-            self._alive = False
 
     def is_alive(self):
-        return self._alive
-
-    def join(self, timeout=None):  # pragma: no cover - compatibility shim
-        return None
+        return False
 
 
-def test_start_uses_injected_thread_factory():
-    config = FakeConfigService()
-    network = FakeNetworkService()
+def test_start_uses_injected_thread_factory(fake_config_service, fake_network_service):
+    config = fake_config_service
+    network = fake_network_service
     clients = []
 
     def fake_client_factory(**_kwargs):
@@ -231,14 +200,14 @@ def test_start_uses_injected_thread_factory():
     threads = []
 
     def fake_thread_factory(**kwargs):
-        thread = FakeThread(**kwargs)
+        thread = NullThread(**kwargs)
         threads.append(thread)
         return thread
 
     manager = CommunicationManager(
         config,
         network,
-        logger=logging.getLogger("test"),
+        logger=TEST_LOGGER,
         client_factory=fake_client_factory,
         thread_factory=fake_thread_factory,
     )
@@ -248,9 +217,114 @@ def test_start_uses_injected_thread_factory():
     assert threads, "Thread factory should be invoked"
     thread = threads[0]
     assert thread.started is True
-    assert not thread.is_alive()
+    assert not clients, "Clients should only be created by the thread target"
+
+    thread.target()
+
     assert clients, "Client factory should create a client"
     client = clients[0]
     assert client.forward_open_called == 1
     assert client.closed == 1
 
+
+class FakeSocket:
+    def __init__(self, on_shutdown=None):
+        self.shutdown_calls = []
+        self.closed = False
+        self._on_shutdown = on_shutdown
+
+    def close(self):
+        self.closed = True
+
+    def shutdown(self, how):
+        if self.closed:
+            raise OSError(errno.EBADF, "Bad file descriptor")
+        self.shutdown_calls.append(how)
+        if self._on_shutdown is not None:
+            self._on_shutdown()
+
+
+class WedgedThread:
+    def __init__(self):
+        self._alive = True
+        self.join_timeouts = []
+
+    def is_alive(self):
+        return self._alive
+
+    def join(self, timeout=None):
+        self.join_timeouts.append(timeout)
+
+    def release(self):
+        self._alive = False
+
+
+def test_stop_shuts_down_client_sockets_when_thread_is_wedged(
+    fake_config_service, fake_network_service
+):
+    manager = CommunicationManager(
+        fake_config_service,
+        fake_network_service,
+        logger=TEST_LOGGER,
+    )
+    thread = WedgedThread()
+    client = FakeClient()
+    client.Sock = FakeSocket(on_shutdown=thread.release)
+    client.MulticastSock = None
+    client.Sock1 = FakeSocket()
+    manager.start_comm_thread_instance = thread
+    manager.clMPU_CIP_Server = client
+
+    manager.stop()
+
+    assert thread.join_timeouts == [5, 1]
+    assert client.Sock.shutdown_calls == [socket.SHUT_RDWR]
+    assert client.Sock1.shutdown_calls == [socket.SHUT_RDWR]
+    assert client.closed == 1
+    assert client.Sock.closed and client.Sock1.closed
+    assert manager.start_comm_thread_instance is None
+
+
+def test_comm_thread_stopped_tracks_thread_lifetime(fake_config_service, fake_network_service):
+    threads = []
+
+    def fake_thread_factory(**kwargs):
+        thread = NullThread(**kwargs)
+        threads.append(thread)
+        return thread
+
+    manager = CommunicationManager(
+        fake_config_service,
+        fake_network_service,
+        logger=TEST_LOGGER,
+        client_factory=lambda **_kwargs: FakeClient(),
+        thread_factory=fake_thread_factory,
+    )
+    assert manager.comm_thread_stopped.is_set()
+
+    manager.start()
+    assert not manager.comm_thread_stopped.is_set()
+
+    threads[0].target()
+    assert manager.comm_thread_stopped.is_set()
+
+
+def test_unchanged_to_frames_are_not_dissected_again(fake_network_service):
+    dissected = []
+
+    class CachingTOPacket:
+        def __init__(self, payload):
+            dissected.append(payload)
+            self.raw_packet_cache = payload
+
+    config = FakeConfigService(to_packet_class=CachingTOPacket)
+    client = FakeClient()
+    client._recv_queue = iter(
+        [SimpleNamespace(payload=SimpleNamespace(load=load)) for load in (b"a", b"a", b"b")]
+    )
+    manager = CommunicationManager(config, fake_network_service, logger=TEST_LOGGER)
+
+    assert manager.manage_io_communication(client) is True
+
+    assert dissected == [b"a", b"b"]
+    assert len(client.send_calls) == 3
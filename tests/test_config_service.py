@@ -1,22 +1,10 @@
-import sys
-import threading
 import types
-from pathlib import Path
 
-import pytest
+from xcipmaster.cli.controller import CLI
+from xcipmaster.config import CIPConfigService
+from xcipmaster.paths import default_config_file
 
-from tests._stubs import install_comm_stub, install_common_stubs
-
-install_common_stubs()
-install_comm_stub()
-
-BASE_DIR = Path(__file__).resolve().parent.parent
-if str(BASE_DIR) not in sys.path:
-    sys.path.insert(0, str(BASE_DIR))
-
-from xcipmaster.cli.controller import CLI  # noqa: E402
-from xcipmaster.config import CIPConfigService  # noqa: E402
-from xcipmaster.paths import default_config_file  # noqa: E402
+from tests._stubs import _NullLock
 
 
 CONFIG_PATH = default_config_file()
@@ -24,7 +12,7 @@ CONFIG_PATH = default_config_file()
 
 class _StubCommManager:
     def __init__(self):
-        self.lock = threading.Lock()
+        self.lock = _NullLock()
         self.enable_auto_reconnect = False
         self.start_comm_thread_instance = None
 
@@ -45,14 +33,6 @@ class _StubNetworkService:
         )
 
 
-@pytest.fixture(scope="module")
-def config_service():
-    service = CIPConfigService()
-    result = service.load_configuration(str(CONFIG_PATH))
-    assert result.success, "Fixture failed to load CIP configuration"
-    return service
-
-
 def test_service_exposes_packet_layouts(config_service):
     layouts = {layout.subtype: layout for layout in config_service.get_packet_layouts()}
 
@@ -99,3 +79,14 @@ def test_cli_uses_service_packets(config_service, monkeypatch):
 
     ot_fields = config_service.get_field_metadata("OT_EO")
     assert ot_fields
+
+
+def test_reloading_configuration_reuses_packet_classes(config_service):
+    reloaded = CIPConfigService()
+    assert reloaded.load_configuration(str(CONFIG_PATH)).success
+
+    for subtype in ("OT_EO", "TO"):
+        assert reloaded.get_packet_class(subtype) is config_service.get_packet_class(subtype)
+        assert reloaded.get_packet_instance(subtype) is not config_service.get_packet_instance(
+            subtype
+        )
@@ -1,9 +1,7 @@
+import threading
 import time
 
 import pytest
-from tests._stubs import install_common_stubs
-
-install_common_stubs()
 from scapy import all as scapy_all
 
 from xcipmaster.fields import (
@@ -11,8 +9,10 @@ from xcipmaster.fields import (
     FieldFormattingError,
     FieldMutator,
     FieldMutationError,
+    FieldStrategy,
     WaveformError,
     WaveformManager,
+    packet_field,
 )
 
 
@@ -27,9 +27,6 @@ class ExamplePacket(scapy_all.Packet):
     ]
 
 
-for _field in ExamplePacket.fields_desc:
-    setattr(ExamplePacket, _field.name, _field)
-
 def test_field_mutator_sets_and_clears_values():
     packet = ExamplePacket()
     mutator = FieldMutator()
@@ -60,6 +57,23 @@ def test_field_mutator_rejects_invalid_values():
         mutator.set_value(packet, "text_field", "toolong")
 
 
+def test_field_mutator_set_values_is_all_or_nothing():
+    packet = ExamplePacket()
+    mutator = FieldMutator()
+
+    mutator.set_values(packet, {"byte_field": "7", "bit_field": "1"})
+    assert packet.byte_field == 7
+    assert packet.bit_field == 1
+
+    with pytest.raises(FieldMutationError):
+        mutator.set_values(packet, {"byte_field": "9", "text_field": "toolong"})
+    assert packet.byte_field == 7
+
+    with pytest.raises(FieldMutationError):
+        mutator.set_values(packet, {"byte_field": "9", "missing": "1"})
+    assert packet.byte_field == 7
+
+
 def test_field_formatter_errors_for_unknown_field():
     packet = ExamplePacket()
     formatter = FieldFormatter()
@@ -81,12 +95,14 @@ class RecordingMutator(FieldMutator):
 class FastClock:
     def __init__(self):
         self.current = time.time()
+        self.slept = threading.Event()
 
     def time(self):
         return self.current
 
     def sleep(self, duration):
         self.current += duration
+        self.slept.set()
 
 
 def test_waveform_manager_generates_values():
@@ -96,7 +112,7 @@ def test_waveform_manager_generates_values():
     manager = WaveformManager(lambda: packet, mutator, sample_interval=0.001, time_module=clock)
 
     manager.start_wave("float_field", 2.0, 0.0, 100)
-    time.sleep(0.01)
+    assert clock.slept.wait(timeout=1)
     manager.stop_wave("float_field")
 
     assert mutator.calls, "Waveform manager should invoke the mutator"
@@ -114,10 +130,37 @@ def test_waveform_manager_validates_fields():
 def test_waveform_manager_stop_all_returns_fields():
     packet = ExamplePacket()
     mutator = FieldMutator()
-    manager = WaveformManager(lambda: packet, mutator)
+    clock = FastClock()
+    manager = WaveformManager(lambda: packet, mutator, time_module=clock)
 
     manager.start_wave("float_field", 1, 0, 100)
-    time.sleep(0.01)
+    assert clock.slept.wait(timeout=1)
     stopped = manager.stop_all()
 
     assert tuple(stopped)  # should contain at least the floating field name
+
+
+def test_most_specific_field_strategy_wins():
+    class BaseField:
+        pass
+
+    class DerivedField(BaseField):
+        pass
+
+    strategies = {
+        BaseField: FieldStrategy(formatter=lambda packet, name: "base"),
+        DerivedField: FieldStrategy(formatter=lambda packet, name: "derived"),
+    }
+    packet_cls = type("Packet", (), {"base": BaseField(), "derived": DerivedField()})
+    formatter = FieldFormatter(strategies)
+
+    assert formatter.format_value(packet_cls(), "base") == "base"
+    assert formatter.format_value(packet_cls(), "derived") == "derived"
+
+
+def test_packet_field_indexes_fields_and_tolerates_missing_packets():
+    packet = ExamplePacket()
+
+    assert packet_field(packet, "byte_field") is ExamplePacket.byte_field
+    assert packet_field(packet, "missing") is None
+    assert packet_field(None, "byte_field") is None
@@ -2,6 +2,8 @@ import logging
 import subprocess
 from typing import List
 
+import pytest
+
 from xcipmaster.network import NetworkCommandRunner, NetworkTestService
 
 
@@ -12,6 +14,7 @@ class FakeRunner(NetworkCommandRunner):
         self.route_error = route_error
         self.ping_calls = []
         self.route_calls = []
+        self._response = subprocess.CompletedProcess([], 0, stdout=route_output, stderr="")
 
     def ping(self, ip_address: str) -> int:  # type: ignore[override]
         self.ping_calls.append(ip_address)
@@ -21,54 +24,40 @@ class FakeRunner(NetworkCommandRunner):
         self.route_calls.append(command)
         if self.route_error:
             raise self.route_error
-        return subprocess.CompletedProcess(command, 0, stdout=self.route_output, stderr="")
+        return self._response
 
 
 def make_service(runner):
     return NetworkTestService(logger=logging.getLogger("test"), runner=runner)
 
 
-def test_communicate_with_target_success():
-    runner = FakeRunner(ping_status=0)
-    service = make_service(runner)
-    service.ip_address = "192.0.2.1"
-
-    assert service.communicate_with_target() is True
-    assert service.net_test_flag is True
-    assert runner.ping_calls == ["192.0.2.1"]
-
-
-def test_communicate_with_target_failure():
-    runner = FakeRunner(ping_status=1)
+@pytest.mark.parametrize("ping_status, expected", [(0, True), (1, False)])
+def test_communicate_with_target(ping_status, expected):
+    runner = FakeRunner(ping_status=ping_status)
     service = make_service(runner)
     service.ip_address = "192.0.2.1"
 
-    assert service.communicate_with_target() is False
-    assert service.net_test_flag is False
+    assert service.communicate_with_target() is expected
+    assert service.net_test_flag is expected
     assert runner.ping_calls == ["192.0.2.1"]
 
 
-def test_get_multicast_route_linux(monkeypatch):
-    output = "default via 10.0.0.1 dev eth0\n224.0.0.0/4 dev eth0"
-    runner = FakeRunner(route_output=output)
-    service = make_service(runner)
-
-    monkeypatch.setattr("xcipmaster.network.platform.system", lambda: "Linux")
-
-    assert service.get_multicast_route() == "224.0.0.0/4"
-    assert service.multicast_route_exist is True
-    assert runner.route_calls == [["ip", "route"]]
-
-
-def test_get_multicast_route_handles_errors(monkeypatch):
-    error = subprocess.CalledProcessError(returncode=1, cmd=["ip", "route"])
-    runner = FakeRunner(route_error=error)
+@pytest.mark.parametrize(
+    "route_output, route_error, expected_route, expected_exist",
+    [
+        ("default via 10.0.0.1 dev eth0\n224.0.0.0/4 dev eth0", None, "224.0.0.0/4", True),
+        ("", subprocess.CalledProcessError(returncode=1, cmd=["ip", "route"]), None, False),
+    ],
+    ids=["linux", "handles-errors"],
+)
+def test_get_multicast_route(monkeypatch, route_output, route_error, expected_route, expected_exist):
+    runner = FakeRunner(route_output=route_output, route_error=route_error)
     service = make_service(runner)
 
     monkeypatch.setattr("xcipmaster.network.platform.system", lambda: "Linux")
 
-    assert service.get_multicast_route() is None
-    assert service.multicast_route_exist is False
+    assert service.get_multicast_route() == expected_route
+    assert service.multicast_route_exist is expected_exist
     assert runner.route_calls == [["ip", "route"]]
 
 
@@ -424,7 +424,7 @@ class _CIPMSPPacketList(scapy_all.PacketListField):
                     raise
                 p = scapy_all.conf.raw_layer(load=remain)
             lst.append(p)
-        return "", lst
+        return b"", lst
 
 
 class CIP_ConnectionParam(scapy_all.Packet):
@@ -523,14 +523,14 @@ class CIP_MultipleServicePacket(scapy_all.Packet):
     def do_build(self):
         """Build the packet by concatenating packets and building the offsets list"""
         # Build the sub packets
-        subpkts = [str(pkt) for pkt in self.packets]
+        subpkts = [bytes(pkt) for pkt in self.packets]
         # Build the offset lists
         current_offset = 2 + 2 * len(subpkts)
         offsets = []
         for p in subpkts:
             offsets.append(struct.pack("<H", current_offset))
             current_offset += len(p)
-        return struct.pack("<H", len(subpkts)) + "".join(offsets) + "".join(subpkts)
+        return struct.pack("<H", len(subpkts)) + b"".join(offsets) + b"".join(subpkts)
 
 
 class CIP_ReqConnectionManager(scapy_all.Packet):
@@ -3,11 +3,13 @@
 # Copyright (c) 2020 Thierry GAUTIER, Wabtec (based on plc.py)
 #
 """Establish all what is needed to communicate with a TGV 2020 DCU"""
+import functools
+import itertools
 import logging
 import socket
 import struct
+from collections import namedtuple
 from scapy import all as scapy_all
-import os
 
 
 from thirdparty.scapy_cip_enip.cip import CIP, CIP_Path, CIP_ReqConnectionManager, \
@@ -22,25 +24,90 @@ from thirdparty.scapy_cip_enip.enip_udp import ENIP_UDP,ENIP_UDP_Item,ENIP_UDP_S
 # Global switch to make it easy to test without sending anything
 NO_NETWORK = False
 
+# Kernel buffer sizes requested for the cyclic CIP IO UDP sockets. The kernel
+# clamps them to net.core.rmem_max / net.core.wmem_max, so raise those sysctls
+# as well when bursts of multicast frames are being dropped.
+UDP_RCVBUF_SIZE = 4 * 1024 * 1024
+UDP_SNDBUF_SIZE = 1024 * 1024
+
+# Send buffer for the explicit message TCP socket. Requests are small and
+# strictly request/response, so this only needs headroom for a few messages;
+# receive autotuning is left to the kernel.
+TCP_SNDBUF_SIZE = 1024 * 1024
+
+# Wire layout of the cyclic O->T frame up to the application data, i.e.
+# ENIP_UDP(count=2) / Sequenced_Address item / Connected_Data_Item header /
+# CIP_IO, all little endian. send_UDP_ENIP_CIP_IO packs it directly instead of
+# building the equivalent scapy stack on every cycle.
+CIP_IO_HEADER = struct.Struct('<HHHIIHHHI')
+CIP_IO_SIZE = len(CIP_IO())
+
+# Leading command/length fields of the 24-byte ENIP encapsulation header
+ENIP_TCP_HEADER = struct.Struct('<HH20x')
+
+# Received T->O frames are decoded with these instead of a scapy dissection:
+# ENIP_UDP item count, then per item type_id/length, then CIP_IO fields.
+ENIP_UDP_COUNT = struct.Struct('<H')
+ENIP_UDP_ITEM_HEADER = struct.Struct('<HH')
+CIP_IO_FIELDS = struct.Struct('<HI')
+
+
+class CIPIOFrame(namedtuple('CIPIOFrame', 'CIP_Sequence_Count Header load')):
+    """Decoded CIP IO frame, a light stand-in for CIP_IO / Raw(load=...)"""
+    __slots__ = ()
+
+    @property
+    def payload(self):
+        # Mirror the scapy layering so frame.payload.load is the AppData
+        return self
+
 logger = logging.getLogger(__name__)
 
-# Create log directory if it doesn't exist
-log_dir = "./log"
-os.makedirs(log_dir, exist_ok=True)
+# Constant request paths, built once. Scapy copies packets when layering
+# them with "/", so sharing these instances between requests is safe.
+CONNECTION_MANAGER_PATH = CIP_Path(wordsize=2, path=b'\x20\x06\x24\x01')
+MESSAGE_ROUTER_PATH = CIP_Path(wordsize=2, path=b'\x20\x02\x24\x01')
+
+# Connection path (9 words) of the forward open/close requests: electronic
+# key segment, then class 0x04 (Assembly) instance 1, connection points 101
+# and 100.
+FORWARD_CONNECTION_PATH = b"\x34\x04\x00\x00\x00\x00\x00\x00\x00\x00\x20\x04\x24\x01\x2C\x65\x2C\x64"
+
+
+@functools.lru_cache(maxsize=128)
+def _make_path(class_id, instance_id):
+    """Cached CIP_Path.make(class_id=..., instance_id=...)"""
+    return CIP_Path.make(class_id=class_id, instance_id=instance_id)
+
+
+def _make_mreq(group, iface_addr=None):
+    """ip_mreq to join the multicast group on iface_addr, or all interfaces"""
+    if iface_addr:
+        return socket.inet_aton(group) + socket.inet_aton(iface_addr)
+    return struct.pack('4sL', socket.inet_aton(group), socket.INADDR_ANY)
+
+
+DEFAULT_MULTICAST_GROUP = '239.192.1.3'
+_DEFAULT_MREQ = _make_mreq(DEFAULT_MULTICAST_GROUP)
+
+
+def set_socket_buffers(sock, rcvbuf=None, sndbuf=None):
+    """Request kernel receive/send buffer sizes (in bytes) for sock"""
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    if sndbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='./log/app.log'
-)
-    
 class Client(object):
     
     """Handle all the state of an Ethernet/IP session with a RER NG project"""
     def __init__(self,
                  IPAddr='10.0.1.1',
-                 MulticastGroupIPaddr='239.192.1.3'):
+                 MulticastGroupIPaddr=DEFAULT_MULTICAST_GROUP,
+                 udp_rcvbuf=UDP_RCVBUF_SIZE,
+                 udp_sndbuf=UDP_SNDBUF_SIZE,
+                 iface_addr=None):
 
         self.PortEtherNetIPExplicitMessage = 44818 #TCP and UDP
         self.PortEtherNetIPImplicitMessageIO = 2222 #TCP and UDP
@@ -55,6 +122,9 @@ class Client(object):
             #open connection with DCU 
             try:
                 self.Sock = socket.create_connection((IPAddr, self.PortEtherNetIPExplicitMessage))
+                # Disable Nagle so each small ENIP request leaves immediately
+                self.Sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                set_socket_buffers(self.Sock, sndbuf=TCP_SNDBUF_SIZE)
             except socket.error as exc:
                 logger.warn("socket error: %s", exc)
                 logger.warn("Continuing without sending anything")
@@ -64,14 +134,27 @@ class Client(object):
             try:
                 # Create the socket
                 self.MulticastSock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                set_socket_buffers(self.MulticastSock, udp_rcvbuf, udp_sndbuf)
+
+                # Let several receivers (processes or threads) share the port
+                self.MulticastSock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                if hasattr(socket, "SO_REUSEPORT"):
+                    self.MulticastSock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
 
-                # Bind to the server address
+                # Bind to the wildcard address: on Linux a socket bound to an
+                # interface address does not receive multicast datagrams
                 self.MulticastSock.bind(('',self.PortEtherNetIPImplicitMessageIO))
 
                 # Tell the operating system to add the socket to the multicast group
-                # on all interfaces.
-                group = socket.inet_aton(MulticastGroupIPaddr)
-                mreq = struct.pack('4sL', group, socket.INADDR_ANY)
+                # on iface_addr, or on all interfaces.
+                if iface_addr:
+                    self.MulticastSock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                                  socket.inet_aton(iface_addr))
+                    mreq = _make_mreq(MulticastGroupIPaddr, iface_addr)
+                elif MulticastGroupIPaddr == DEFAULT_MULTICAST_GROUP:
+                    mreq = _DEFAULT_MREQ
+                else:
+                    mreq = _make_mreq(MulticastGroupIPaddr)
                 self.MulticastSock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
             except:
                 logger.warn("Not possible to manage multicast group ip address")
@@ -80,6 +163,7 @@ class Client(object):
             #open connection with DCU TODO
             try:
                 self.Sock1 = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                set_socket_buffers(self.Sock1, udp_rcvbuf, udp_sndbuf)
                 self.Sock1.connect((IPAddr, self.PortEtherNetIPImplicitMessageIO))
             except socket.error as exc:
                 logger.warn("socket error: %s", exc)
@@ -93,8 +177,18 @@ class Client(object):
         self.session_id = 0
         self.enip_connection_id_OT = 0 #required for CIP IO O->T
         self.enip_connection_id_TO = 0 #required for CIP IO T->O
-        self.sequence_unit_cip = 1
-        self.sequence_CIP_IO = 1
+        # next() on itertools.count is atomic, unlike "+= 1" on an attribute
+        self._seq_unit_cip = itertools.count(1)
+        self._seq_CIP_IO = itertools.count(1)
+        self._last_seq_unit_cip = 0
+        self._last_seq_CIP_IO = 0
+        self._cip_io_header = bytearray(CIP_IO_HEADER.size)
+        # receive buffers reused for every packet, see recv_enippkt/recv_UDP_ENIP_CIP_IO
+        self._tcp_rx = bytearray(4096)
+        self._tcp_rx_view = memoryview(self._tcp_rx)
+        self._udp_rx = bytearray(2048)
+        self._udp_rx_view = memoryview(self._udp_rx)
+        self._multicast_timeout = None
 
         # Open an Ethernet/IP session
         sessionpkt = ENIP_TCP() / ENIP_RegisterSession()
@@ -117,116 +211,205 @@ class Client(object):
     def connected(self):
         return True if self.Sock else False
 
+    @property
+    def sequence_unit_cip(self):
+        """Last sequence number sent by send_unit_cip, 0 if none yet"""
+        return self._last_seq_unit_cip
+
+    @property
+    def sequence_CIP_IO(self):
+        """Last sequence number sent by send_UDP_ENIP_CIP_IO, 0 if none yet"""
+        return self._last_seq_CIP_IO
+
     def send_rr_cip(self, cippkt):
         """Send a CIP packet over the TCP connection as an ENIP Req/Rep Data"""
+        enippkt = self._make_rr_enippkt(cippkt)
+        if self.Sock is not None:
+            self.Sock.send(bytes(enippkt))
+
+    def send_rr_cip_many(self, cippkts):
+        """Send several CIP packets as ENIP Req/Rep Data with a single vectored write"""
+        frames = [bytes(self._make_rr_enippkt(cippkt)) for cippkt in cippkts]
+        if self.Sock is None:
+            return
+        if not hasattr(self.Sock, "sendmsg"):
+            self.Sock.sendall(b''.join(frames))
+            return
+        while frames:
+            sent = self.Sock.sendmsg(frames)
+            # sendmsg may stop short, drop what went out and resend the rest
+            while frames and sent >= len(frames[0]):
+                sent -= len(frames.pop(0))
+            if sent:
+                frames[0] = frames[0][sent:]
+
+    def _make_rr_enippkt(self, cippkt):
+        """Wrap a CIP packet into an ENIP Req/Rep Data packet"""
         enippkt = ENIP_TCP(session=self.session_id)
         enippkt /= ENIP_SendRRData(items=[
             ENIP_SendUnitData_Item(type_id=0),
             ENIP_SendUnitData_Item() / cippkt
         ])
-        if self.Sock is not None:
-            self.Sock.send(bytes(enippkt))
+        return enippkt
 
     def send_rr_cm_cip(self, cippkt):
         """Encapsulate the CIP packet into a ConnectionManager packet"""
         cipcm_msg = [cippkt]
-        cippkt = CIP(path=CIP_Path.make(class_id=6, instance_id=1))
+        cippkt = CIP(path=_make_path(6, 1))
         cippkt /= CIP_ReqConnectionManager(message=cipcm_msg)
         self.send_rr_cip(cippkt)
 
     def send_rr_mr_cip(self, cippkt):
-        """Encapsulate the CIP packet into a MultipleServicePacket to MessageRouter"""
-        cipcm_msg = [cippkt]
-        cippkt = CIP(path=CIP_Path(wordsize=2, path=b'\x20\x02\x24\x01'))
+        """Encapsulate the CIP packet (or list of packets) into a MultipleServicePacket to MessageRouter"""
+        self.send_rr_cip(self._make_mr_cip(cippkt))
+
+    @staticmethod
+    def _make_mr_cip(cippkt):
+        """Wrap the CIP packet (or list of packets) into a MultipleServicePacket to MessageRouter"""
+        cipcm_msg = list(cippkt) if isinstance(cippkt, (list, tuple)) else [cippkt]
+        cippkt = CIP(path=MESSAGE_ROUTER_PATH)
         cippkt /= CIP_MultipleServicePacket(packets=cipcm_msg)
-        self.send_rr_cip(cippkt)
+        return cippkt
 
     def send_unit_cip(self, cippkt):
         """Send a CIP packet over the TCP connection as an ENIP Unit Data"""
+        seq = self._last_seq_unit_cip = next(self._seq_unit_cip)
         enippkt = ENIP_TCP(session=self.session_id)
         enippkt /= ENIP_SendUnitData(items=[
             ENIP_SendUnitData_Item() / ENIP_ConnectionAddress(connection_id=self.enip_connection_id_OT),
-            ENIP_SendUnitData_Item() / ENIP_ConnectionPacket(sequence=self.sequence_unit_cip) / cippkt
+            ENIP_SendUnitData_Item() / ENIP_ConnectionPacket(sequence=seq) / cippkt
         ])
-        self.sequence_unit_cip += 1
         if self.Sock is not None:
             self.Sock.send(bytes(enippkt))
 
     def recv_enippkt(self):
-        """Receive an ENIP packet from the TCP socket"""
+        """Receive exactly one ENIP packet from the TCP socket
+
+        The 24-byte ENIP header is read first, then the number of bytes it
+        declares, so a reply split across several TCP segments, or followed
+        by the reply to a pipelined request, is framed correctly"""
         self.logger.info("TGV2020: recv_enippkt executing")
         if self.Sock is None:
             self.logger.warning("TGV2020: recv_enippkt: self.sock is None")
             return
-        pktbytes = self.Sock.recv(2000)
-        pkt = ENIP_TCP(pktbytes)
+        self._recv_tcp_exactly(0, ENIP_TCP_HEADER.size)
+        (_, length) = ENIP_TCP_HEADER.unpack_from(self._tcp_rx, 0)
+        total = ENIP_TCP_HEADER.size + length
+        if total > len(self._tcp_rx):
+            # rare large reply: grow the receive buffer, keeping the header
+            self._tcp_rx = self._tcp_rx + bytearray(total - len(self._tcp_rx))
+            self._tcp_rx_view = memoryview(self._tcp_rx)
+        self._recv_tcp_exactly(ENIP_TCP_HEADER.size, total)
+        pkt = ENIP_TCP(bytes(self._tcp_rx_view[:total]))
         self.logger.info("TGV2020: recv_enippkt: returning enip_tcp packet received")
         return pkt
 
+    def _recv_tcp_exactly(self, start, end):
+        """Fill self._tcp_rx[start:end] from the TCP socket"""
+        while start < end:
+            nbytes = self.Sock.recv_into(self._tcp_rx_view[start:end])
+            if nbytes == 0:
+                raise ConnectionError("ENIP connection closed by peer")
+            start += nbytes
+
     def recv_UDP_ENIP_CIP_IO(self,DEBUG=bool(False),Timeout=0):
         """receive cyclic mulicast CIP IO like <AS_DCUi_MPU_DATA>"""
         
-        self.logger.info("TGV2020: recv_UDP_ENIP_CIP_IO executing")
+        self.logger.debug("TGV2020: recv_UDP_ENIP_CIP_IO executing")
         
         if self.MulticastSock is None:
             self.logger.warning("TGV2020: recv_UDP_ENIP_CIP_IO: self.MulticastSock is None")
             return None
         
         #fix timeout
-        self.MulticastSock.settimeout(Timeout)
-        self.logger.info("TGV2020: recv_UDP_ENIP_CIP_IO: Multicast timeout set")
+        self._set_multicast_timeout(Timeout)
         
         #wait CIP IO frame during Timeout
         try:
-            (pktbytes, address) = self.MulticastSock.recvfrom(2000)
+            nbytes = self.MulticastSock.recv_into(self._udp_rx)
+        except (socket.timeout, BlockingIOError):
+            # nothing received within Timeout (or nothing queued when Timeout=0)
+            self.logger.debug("TGV2020: recv_UDP_ENIP_CIP_IO: NO CIP_IO packet is returned")
+            return None
+        except OSError as exc:
+            self.logger.warning("TGV2020: recv_UDP_ENIP_CIP_IO: socket error: %s", exc)
+            return None
 
-            #extract ethernet/IP part
-            pkt_udp = ENIP_UDP(pktbytes)
+        try:
+            pkgCIP_IO = self._parse_CIP_IO(self._udp_rx_view[:nbytes], DEBUG)
+        except Exception:
+            self.logger.exception("TGV2020: recv_UDP_ENIP_CIP_IO: unable to decode CIP_IO frame")
+            return None
 
-            if(DEBUG):
-                pkt_udp.show()
+        self.logger.debug("TGV2020: recv_UDP_ENIP_CIP_IO: CIP_IO packet is returned")
+        return pkgCIP_IO
+
+    def _set_multicast_timeout(self, Timeout):
+        """Apply Timeout to MulticastSock, skipping the syscall when unchanged"""
+        if Timeout != self._multicast_timeout:
+            self.MulticastSock.settimeout(Timeout)
+            self._multicast_timeout = Timeout
+
+    @staticmethod
+    def _parse_CIP_IO(pktbytes, DEBUG=bool(False)):
+        """Extract the CIP_IO part of a received ENIP UDP frame (any bytes-like object)"""
+        if(DEBUG):
+            #extract ethernet/IP part
+            pkt_udp = ENIP_UDP(bytes(pktbytes))
+            pkt_udp.show()
 
             #extract CIP IO part
             pkgCIP_IO = CIP_IO(pkt_udp.items[1].payload.load)
+            pkgCIP_IO.show()
+            return pkgCIP_IO
 
-            if(DEBUG):
-                pkgCIP_IO.show()
+        (count,) = ENIP_UDP_COUNT.unpack_from(pktbytes, 0)
+        if count != 2:
+            raise ValueError("expected 2 ENIP UDP items, got %d" % count)
 
-            self.logger.info("TGV2020: recv_UDP_ENIP_CIP_IO: CIP_IO packet is returned")
-            return pkgCIP_IO
+        # skip the Sequenced_Address item, then read the Connected_Data_Item
+        (_, address_length) = ENIP_UDP_ITEM_HEADER.unpack_from(pktbytes, ENIP_UDP_COUNT.size)
+        data_offset = ENIP_UDP_COUNT.size + ENIP_UDP_ITEM_HEADER.size + address_length
+        (_, data_length) = ENIP_UDP_ITEM_HEADER.unpack_from(pktbytes, data_offset)
+        data_offset += ENIP_UDP_ITEM_HEADER.size
+        if data_length < CIP_IO_FIELDS.size or data_offset + data_length > len(pktbytes):
+            raise ValueError("truncated CIP IO frame")
 
-        except:
-            self.logger.warning("TGV2020: recv_UDP_ENIP_CIP_IO: NO CIP_IO packet is returned")
-            #self.MulticastSock.close()
-            return None
+        (sequence_count, header) = CIP_IO_FIELDS.unpack_from(pktbytes, data_offset)
+        app_data = bytes(pktbytes[data_offset + CIP_IO_FIELDS.size:data_offset + data_length])
+        return CIPIOFrame(sequence_count, header, app_data)
 
 
     def send_UDP_ENIP_CIP_IO(self,CIP_Sequence_Count=0,Header=0,AppData=None):
         """send cyclic unicast CIP IO like <AS_MPU_DCUi_DATA>"""
-        self.logger.info("TGV2020: send_UDP_ENIP_CIP_IO executing")
-        enippkt = ENIP_UDP(count=2,items=[
-            ENIP_UDP_Item(type_id="Sequenced_Address",length=8) / ENIP_UDP_SequencedAddress(connection_id=self.enip_connection_id_OT, sequence=self.sequence_CIP_IO),
-            ENIP_UDP_Item(type_id="Connected_Data_Item",length=len(AppData)+len(CIP_IO()))
-        ])
-        #add CIP IO part
-        enippkt /= CIP_IO(CIP_Sequence_Count=CIP_Sequence_Count,Header=Header)
-        
-        #add data application part of the project
-        enippkt /= AppData
-
-        self.sequence_CIP_IO += 1
-        self.logger.info(f"TGV2020: send_UDP_ENIP_CIP_IO: sequence_CIP_IO {self.sequence_CIP_IO}")
+        self.logger.debug("TGV2020: send_UDP_ENIP_CIP_IO executing")
+        payload = bytes(AppData) if AppData is not None else b''
+        # the sequenced address carries a 32 bit counter
+        seq = self._last_seq_CIP_IO = next(self._seq_CIP_IO) & 0xFFFFFFFF
+        CIP_IO_HEADER.pack_into(
+            self._cip_io_header, 0,
+            2,                                      # ENIP_UDP item count
+            0x8002, 8,                              # Sequenced_Address item
+            self.enip_connection_id_OT, seq,
+            0x00b1, CIP_IO_SIZE + len(payload),     # Connected_Data_Item
+            CIP_Sequence_Count, Header)             # CIP_IO
+
+        self.logger.debug("TGV2020: send_UDP_ENIP_CIP_IO: sequence_CIP_IO %d", seq)
         if self.Sock1 is not None:
-            self.logger.info("TGV2020: send_UDP_ENIP_CIP_IO: Sending UDP_ENIP_CIP_IO through socket")
-            self.Sock1.send(bytes(enippkt))
+            self.logger.debug("TGV2020: send_UDP_ENIP_CIP_IO: Sending UDP_ENIP_CIP_IO through socket")
+            if hasattr(self.Sock1, "sendmsg"):
+                # Scatter-gather send, no header + payload concatenation
+                self.Sock1.sendmsg([self._cip_io_header, payload])
+            else:
+                self.Sock1.send(bytes(self._cip_io_header) + payload)
         else:
             self.logger.warning("TGV2020: send_UDP_ENIP_CIP_IO: Socket error: failed to send UDP_ENIP_CIP_IO")
 
     def forward_open(self):
         """Send a forward open request"""
         self.logger.info("TGV2020: forward_open executing")
-        cippkt = CIP(service=0x54, path=CIP_Path(wordsize=2, path=b'\x20\x06\x24\x01'))
-        cippkt /= CIP_ReqForwardOpen(connection_path_size=9, connection_path=b"\x34\x04\x00\x00\x00\x00\x00\x00\x00\x00\x20\x04\x24\x01\x2C\x65\x2C\x64",
+        cippkt = CIP(service=0x54, path=CONNECTION_MANAGER_PATH)
+        cippkt /= CIP_ReqForwardOpen(connection_path_size=9, connection_path=FORWARD_CONNECTION_PATH,
                                      OT_connection_param=self.ot_connection_param, TO_connection_param=self.to_connection_param)
         self.send_rr_cip(cippkt)
         resppkt = self.recv_enippkt()
@@ -245,8 +428,8 @@ class Client(object):
 
     def forward_close(self):
         """Send a forward close request"""
-        cippkt = CIP(service=0x4e, path=CIP_Path(wordsize=2, path=b'\x20\x06\x24\x01'))
-        cippkt /= CIP_ReqForwardClose(connection_path_size=9, connection_path=b"\x34\x04\x00\x00\x00\x00\x00\x00\x00\x00\x20\x04\x24\x01\x2C\x65\x2C\x64")
+        cippkt = CIP(service=0x4e, path=CONNECTION_MANAGER_PATH)
+        cippkt /= CIP_ReqForwardClose(connection_path_size=9, connection_path=FORWARD_CONNECTION_PATH)
         self.send_rr_cip(cippkt)
         if self.Sock is None:
             return
@@ -264,7 +447,7 @@ class Client(object):
         # Get_Attribute_Single does not seem to work properly
         # path = CIP_Path.make(class_id=class_id, instance_id=instance, attribute_id=attr)
         # cippkt = CIP(service=0x0e, path=path)  # Get_Attribute_Single
-        path = CIP_Path.make(class_id=class_id, instance_id=instance)
+        path = _make_path(class_id, instance)
         cippkt = CIP(path=path) / CIP_ReqGetAttributeList(attrs=[attr])
         self.send_rr_cm_cip(cippkt)
         if self.Sock is None:
@@ -283,7 +466,7 @@ class Client(object):
 
     def set_attribute(self, class_id, instance, attr, value):
         """Set the value of attribute class/instance/attr"""
-        path = CIP_Path.make(class_id=class_id, instance_id=instance)
+        path = _make_path(class_id, instance)
         # User CIP service 4: Set_Attribute_List
         cippkt = CIP(service=4, path=path) / scapy_all.Raw(load=struct.pack('<HH', 1, attr) + value)
         self.send_rr_cm_cip(cippkt)
@@ -302,7 +485,7 @@ class Client(object):
         start_instance = 0
         inst_list = []
         while True:
-            cippkt = CIP(service=0x4b, path=CIP_Path.make(class_id=class_id, instance_id=start_instance))
+            cippkt = CIP(service=0x4b, path=_make_path(class_id, start_instance))
             self.send_rr_cm_cip(cippkt)
             if self.Sock is None:
                 return
@@ -310,8 +493,7 @@ class Client(object):
 
             # Decode a list of 32-bit integers
             data = bytes(resppkt[CIP].payload)
-            for i in range(0, len(data), 4):
-                inst_list.append(struct.unpack('<I', data[i:i + 4])[0])
+            inst_list.extend(value for (value,) in struct.iter_unpack('<I', data[:len(data) & ~3]))
             
             cipstatus = resppkt[CIP].status[0].status
             if cipstatus == 0:
@@ -330,7 +512,7 @@ class Client(object):
         remaining_size = total_size
 
         while remaining_size > 0:
-            cippkt = CIP(service=0x4c, path=CIP_Path.make(class_id=class_id, instance_id=instance_id))
+            cippkt = CIP(service=0x4c, path=_make_path(class_id, instance_id))
             cippkt /= CIP_ReqReadOtherTag(start=offset, length=remaining_size)
             self.send_rr_cm_cip(cippkt)
             if self.Sock is None:
@@ -359,21 +541,14 @@ class Client(object):
     @staticmethod
     def attr_format(attrval):
         """Format an attribute value to be displayed to a human"""
-        attr_bytes = bytearray(attrval)
-        if len(attrval) == 1:
-            # 1-byte integer
-            return hex(struct.unpack('B', attrval)[0])
-        elif len(attrval) == 2:
-            # 2-byte integer
-            return hex(struct.unpack('<H', attrval)[0])
-        elif len(attrval) == 4:
-            # 4-byte integer
-            return hex(struct.unpack('<I', attrval)[0])
-        elif all(b == 0 for b in attr_bytes):
+        if len(attrval) in (1, 2, 4):
+            # 1, 2 or 4-byte little endian integer
+            return hex(int.from_bytes(attrval, 'little'))
+        elif not any(attrval):
             # a series of zeros
             return '[{} zeros]'.format(len(attrval))
         # format in hexadecimal the content of attrval
-        return ' '.join('{:02x}'.format(b) for b in attr_bytes)
+        return bytes(attrval).hex(' ')
 
 
 
@@ -1,73 +1,161 @@
 """Command definitions for the CIP CLI."""
 
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
 import cmd as cmd_module
-import shlex
-import time
+import signal
+import threading
 
 import click
 
-from .controller import CLI
+from .controller import CLI, configure_logging
 from xcipmaster.paths import default_config_directory
 
 
 ENABLE_NETWORK = True
 
 
+def _bootstrap(controller: CLI) -> None:
+    """Display the startup banner and progress bar once per session.
+
+    The default CIP configuration loads in the background meanwhile.
+    """
+
+    controller.preload_configuration()
+    controller.display_banner()
+    controller.progress_bar("Initializing", 1)
+
+
+def _require_configuration(controller: CLI) -> None:
+    """Abort the command unless a valid CIP configuration is loaded.
+
+    Every command calls this on entry. After the first success it costs a
+    single ``stat``, because :meth:`CLI.ensure_configuration` only reloads
+    the configuration when its file changes.
+    """
+
+    if not controller.ensure_configuration():
+        raise click.ClickException("CIP configuration failed.")
+
+
+def _prompt_net_addresses(
+    controller: CLI,
+    *,
+    target_ip: Optional[str] = None,
+    multicast_ip: Optional[str] = None,
+) -> tuple[str, str]:
+    """Return the target and multicast addresses, prompting only for missing ones."""
+
+    if not target_ip:
+        target_ip = click.prompt(
+            "Target IP address", default=controller.target_ip, show_default=True
+        )
+    if not multicast_ip:
+        multicast_ip = click.prompt(
+            "Multicast group address", default=controller.multicast_ip, show_default=True
+        )
+    return target_ip, multicast_ip
+
+
+def _configure(ctx: click.Context, controller: CLI) -> None:
+    """Validate the CIP and network configuration for an interactive session."""
+
+    invoked_command = ctx.invoked_subcommand
+    has_subcommand = bool(invoked_command or ctx.args)
+    if has_subcommand:
+        return
+
+    if controller.cip_test_flag:
+        if not click.confirm("Do you want to continue?", default=True):
+            click.echo("Exiting...")
+            ctx.exit()
+
+    if not controller.ensure_configuration(controller.default_config_path):
+        raise click.ClickException("CIP configuration failed during initialization.")
+
+    if ENABLE_NETWORK:
+        target_ip, multicast_ip = _prompt_net_addresses(controller)
+
+        if not controller.ensure_network_configuration(
+            target_ip, multicast_ip, force=True
+        ):
+            raise click.ClickException(
+                "Network configuration failed during initialization."
+            )
+
+
 def _initialize_controller(
     ctx: click.Context, factory: Callable[[], CLI] = CLI
 ) -> CLI:
     """Create and prepare the :class:`CLI` controller for interactive sessions.
 
     Tests can supply a custom ``factory`` (for example ``lambda: CLI(test_mode=True)``)
-    to inject stub services and bypass the interactive startup behaviour.
+    to inject stub services and bypass the interactive startup behaviour.  A
+    controller already attached to ``ctx.obj`` is reused as-is.
     """
 
+    if ctx.obj is not None:
+        return ctx.obj
+
     controller = factory()
+    ctx.obj = controller
 
     if not controller.test_mode and not ctx.resilient_parsing:
-        controller.display_banner()
-        controller.progress_bar("Initializing", 1)
-
-        invoked_command = ctx.invoked_subcommand
-        has_subcommand = bool(invoked_command or ctx.args)
-
-        if not has_subcommand and controller.cip_test_flag:
-            if not click.confirm("Do you want to continue?", default=True):
-                click.echo("Exiting...")
-                ctx.exit()
-
-        if not has_subcommand:
-            if not controller.ensure_configuration(controller.default_config_path):
-                raise click.ClickException("CIP configuration failed during initialization.")
-
-            if ENABLE_NETWORK:
-                target_ip = click.prompt(
-                    "Target IP address",
-                    default=controller.target_ip,
-                    show_default=True,
-                )
-                multicast_ip = click.prompt(
-                    "Multicast group address",
-                    default=controller.multicast_ip,
-                    show_default=True,
-                )
-
-                if not controller.ensure_network_configuration(
-                    target_ip, multicast_ip, force=True
-                ):
-                    raise click.ClickException(
-                        "Network configuration failed during initialization."
-                    )
+        _bootstrap(controller)
+        _configure(ctx, controller)
 
     return controller
 
 
+def _wait_for_comm(controller: CLI) -> None:
+    """Block until the communication thread exits; Ctrl-C stops communication.
+
+    The wait is a plain ``join()`` rather than a polling loop: a SIGINT
+    handler stops the communication manager, which lets the thread finish.
+    A second Ctrl-C while stopping raises :class:`KeyboardInterrupt`.
+    """
+
+    thread = controller.start_comm_thread_instance
+    if thread is None:
+        return
+
+    stopping = threading.Event()
+
+    def _on_sigint(_signum, _frame):
+        if stopping.is_set():
+            raise KeyboardInterrupt
+        stopping.set()
+        click.echo("\nStopping communication...")
+        controller.comm_manager.stop()
+
+    try:
+        previous_handler = signal.signal(signal.SIGINT, _on_sigint)
+    except ValueError:
+        # Signal handlers can only be installed from the main thread
+        thread.join()
+        return
+
+    try:
+        thread.join()
+    finally:
+        # None means the previous handler was not installed from Python
+        signal.signal(signal.SIGINT, previous_handler or signal.default_int_handler)
+
+
 pass_controller = click.make_pass_decorator(CLI)
 
 
+def _split_line(line: str) -> list[str]:
+    """Split a shell line into words, using :mod:`shlex` only for quoted input."""
+
+    if '"' in line or "'" in line or "\\" in line:
+        import shlex  # only quoted input needs it
+
+        return shlex.split(line)
+    return line.split()
+
+
 class CIPShell(cmd_module.Cmd):
     prompt = "cip> "
     intro = "Type 'help' to list commands. Type 'exit' or 'quit' to leave."
@@ -75,6 +163,26 @@ class CIPShell(cmd_module.Cmd):
     def __init__(self, ctx: click.Context):
         super().__init__()
         self.group_ctx = ctx.parent or ctx
+        # Dispatch table built once; every command is registered by the time
+        # the shell starts.
+        command_source = getattr(self.group_ctx, "command", None)
+        if command_source is None or not hasattr(command_source, "get_command"):
+            self._commands = None
+        else:
+            self._commands = {
+                name: command_source.get_command(self.group_ctx, name)
+                for name in command_source.list_commands(self.group_ctx)
+            }
+
+    def _lookup_command(self, command_name: str):
+        if self._commands is None:
+            click.echo("Interactive shell is not attached to a command group.", err=True)
+            return None
+
+        command = self._commands.get(command_name)
+        if command is None:
+            click.echo(f"Unknown command: {command_name}", err=True)
+        return command
 
     def do_exit(self, arg):  # pragma: no cover - interactive helper
         """Exit the interactive shell."""
@@ -83,41 +191,32 @@ class CIPShell(cmd_module.Cmd):
     do_quit = do_exit  # pragma: no cover
 
     def do_help(self, arg):  # pragma: no cover - interactive helper
-        args = shlex.split(arg)
+        args = _split_line(arg)
         if not args:
             self.group_ctx.invoke(help_command)
             return
 
-        command_source = getattr(self.group_ctx, "command", None)
-        if command_source is None or not hasattr(command_source, "get_command"):
-            click.echo("Interactive shell is not attached to a command group.")
-            return
-
-        command = command_source.get_command(self.group_ctx, args[0])
+        command = self._lookup_command(args[0])
         if command is None:
-            click.echo(f"Unknown command: {args[0]}")
             return
 
-        with command.make_context(command.name, args[1:], parent=self.group_ctx) as cmd_ctx:
-            click.echo(command.get_help(cmd_ctx))
+        # A bare context is enough for get_help; make_context would parse
+        # arguments and fail on commands with required ones, e.g. "help wave"
+        cmd_ctx = click.Context(command, info_name=command.name, parent=self.group_ctx)
+        click.echo(command.get_help(cmd_ctx))
 
     def default(self, line):  # pragma: no cover - interactive helper
-        args = shlex.split(line)
+        args = _split_line(line)
         if not args:
             return
+        command_name, command_args = args[0], args[1:]
 
-        command_source = getattr(self.group_ctx, "command", None)
-        if command_source is None or not hasattr(command_source, "get_command"):
-            click.echo("Interactive shell is not attached to a command group.")
-            return
-
-        command = command_source.get_command(self.group_ctx, args[0])
+        command = self._lookup_command(command_name)
         if command is None:
-            click.echo(f"Unknown command: {args[0]}")
             return
 
         try:
-            with command.make_context(command.name, args[1:], parent=self.group_ctx) as cmd_ctx:
+            with command.make_context(command.name, command_args, parent=self.group_ctx) as cmd_ctx:
                 command.invoke(cmd_ctx)
         except click.ClickException as exc:
             exc.show()
@@ -129,8 +228,10 @@ class CIPShell(cmd_module.Cmd):
 @click.pass_context
 def cli(ctx):
     """CIP Tool command-line interface."""
-    if ctx.obj is None and not ctx.resilient_parsing:
-        ctx.obj = _initialize_controller(ctx, CLI)
+    if not ctx.resilient_parsing:
+        if ctx.obj is None:
+            configure_logging()
+        _initialize_controller(ctx, CLI)
 
     if ctx.invoked_subcommand is None and not ctx.args and not ctx.resilient_parsing:
         ctx.invoke(cmd_shell)
@@ -142,31 +243,22 @@ def start(controller: CLI):
     """Validate configuration, test networking, and start communication."""
 
     if controller.enable_auto_reconnect:
-        click.echo("Disabled auto-Connect using the CMD: <man> and try again !!!")
+        click.echo("Disabled auto-Connect using the CMD: <man> and try again !!!", err=True)
         return
 
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
 
     if ENABLE_NETWORK:
-        current_ip = getattr(controller.network_service, "ip_address", None)
-        current_multicast = getattr(
-            controller.network_service, "user_multicast_address", None
-        )
+        network_service = controller.network_service
+        current_ip = getattr(network_service, "ip_address", None)
+        current_multicast = getattr(network_service, "user_multicast_address", None)
 
         if current_ip is None or current_multicast is None:
             if controller.test_mode:
                 target_ip = controller.target_ip
                 multicast_ip = controller.multicast_ip
             else:
-                target_ip = click.prompt(
-                    "Target IP address", default=controller.target_ip, show_default=True
-                )
-                multicast_ip = click.prompt(
-                    "Multicast group address",
-                    default=controller.multicast_ip,
-                    show_default=True,
-                )
+                target_ip, multicast_ip = _prompt_net_addresses(controller)
 
             if not controller.ensure_network_configuration(
                 target_ip, multicast_ip, force=True
@@ -178,15 +270,7 @@ def start(controller: CLI):
     click.echo("Attempting to Start communication...")
     controller.comm_manager.start()
 
-    try:
-        while (
-            controller.start_comm_thread_instance is not None
-            and controller.start_comm_thread_instance.is_alive()
-        ):
-            controller.start_comm_thread_instance.join(timeout=0.5)
-    except KeyboardInterrupt:
-        click.echo("\nStopping communication...")
-        controller.comm_manager.stop()
+    _wait_for_comm(controller)
 
 
 @cli.command()
@@ -194,7 +278,7 @@ def start(controller: CLI):
 def stop(controller: CLI):
     """Stop communication."""
     if controller.enable_auto_reconnect:
-        click.echo("Disabled auto-Connect using the CMD: <man> and try again !!!")
+        click.echo("Disabled auto-Connect using the CMD: <man> and try again !!!", err=True)
         return
 
     click.echo("Attempting to Stop communication...")
@@ -209,8 +293,7 @@ def auto(controller: CLI):
         click.echo("Already in auto-reconnect mode.")
         return
 
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
 
     if ENABLE_NETWORK and not controller.ensure_network_configuration():
         raise click.ClickException("Network configuration failed.")
@@ -219,15 +302,7 @@ def auto(controller: CLI):
     controller.comm_manager.enable_auto()
     controller.comm_manager.start()
 
-    try:
-        while (
-            controller.start_comm_thread_instance is not None
-            and controller.start_comm_thread_instance.is_alive()
-        ):
-            controller.start_comm_thread_instance.join(timeout=0.5)
-    except KeyboardInterrupt:
-        click.echo("\nStopping communication...")
-        controller.comm_manager.stop()
+    _wait_for_comm(controller)
 
 
 @cli.command()
@@ -237,7 +312,7 @@ def man(controller: CLI):
     if controller.enable_auto_reconnect:
         click.echo("Switching to Manual Connect Mode!")
         controller.comm_manager.disable_auto()
-        time.sleep(2)
+        controller.comm_manager.comm_thread_stopped.wait(timeout=2)
     else:
         click.echo("Already in manual mode")
 
@@ -245,12 +320,19 @@ def man(controller: CLI):
 @cli.command("set")
 @click.argument("field_name")
 @click.argument("value")
+@click.argument("more", nargs=-1, metavar="[FIELD_NAME VALUE]...")
 @pass_controller
-def set_field_command(controller: CLI, field_name: str, value: str):
-    """Set a field value."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
-    controller.set_field(field_name, value)
+def set_field_command(controller: CLI, field_name: str, value: str, more: Tuple[str, ...]):
+    """Set a field value, or several fields at once."""
+    _require_configuration(controller)
+    if not more:
+        controller.set_field(field_name, value)
+        return
+    if len(more) % 2:
+        raise click.UsageError("Each field name needs a value.")
+    updates = {field_name: value}
+    updates.update(zip(more[::2], more[1::2]))
+    controller.set_fields(updates)
 
 
 @cli.command("clear")
@@ -258,8 +340,7 @@ def set_field_command(controller: CLI, field_name: str, value: str):
 @pass_controller
 def clear_field_command(controller: CLI, field_name: str):
     """Clear a field value."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.clear_field(field_name)
 
 
@@ -268,8 +349,7 @@ def clear_field_command(controller: CLI, field_name: str):
 @pass_controller
 def get_field_command(controller: CLI, field_name: str):
     """Get the current value of a field."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.get_field(field_name)
 
 
@@ -277,8 +357,7 @@ def get_field_command(controller: CLI, field_name: str):
 @pass_controller
 def frame_command(controller: CLI):
     """Print the packet header and payload."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.print_frame()
 
 
@@ -286,42 +365,45 @@ def frame_command(controller: CLI):
 @pass_controller
 def fields_command(controller: CLI):
     """Display available fields."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.list_fields()
 
 
+def _waveform_arguments(command: Callable) -> Callable:
+    """Attach the arguments shared by the ``wave``, ``tria`` and ``box`` commands."""
+
+    for argument in reversed(
+        (
+            click.argument("field_name"),
+            click.argument("max_value", type=float),
+            click.argument("min_value", type=float),
+            click.argument("period", type=int),
+        )
+    ):
+        command = argument(command)
+    return command
+
+
 @cli.command("wave")
-@click.argument("field_name")
-@click.argument("max_value", type=float)
-@click.argument("min_value", type=float)
-@click.argument("period", type=int)
+@_waveform_arguments
 @pass_controller
 def wave_command(controller: CLI, field_name: str, max_value: float, min_value: float, period: int):
     """Start a sine waveform for a field."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.wave_field(field_name, max_value, min_value, period)
 
 
 @cli.command("tria")
-@click.argument("field_name")
-@click.argument("max_value", type=float)
-@click.argument("min_value", type=float)
-@click.argument("period", type=int)
+@_waveform_arguments
 @pass_controller
 def tria_command(controller: CLI, field_name: str, max_value: float, min_value: float, period: int):
     """Start a triangular waveform for a field."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.tria_field(field_name, max_value, min_value, period)
 
 
 @cli.command("box")
-@click.argument("field_name")
-@click.argument("max_value", type=float)
-@click.argument("min_value", type=float)
-@click.argument("period", type=int)
+@_waveform_arguments
 @click.argument("duty_cycle", type=float)
 @pass_controller
 def box_command(
@@ -333,8 +415,7 @@ def box_command(
     duty_cycle: float,
 ):
     """Start a square waveform for a field."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.box_field(field_name, max_value, min_value, period, duty_cycle)
 
 
@@ -343,8 +424,7 @@ def box_command(
 @pass_controller
 def live_command(controller: CLI, refresh_rate: float):
     """Display live field data."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.live_field_data(refresh_rate)
 
 
@@ -353,8 +433,7 @@ def live_command(controller: CLI, refresh_rate: float):
 @pass_controller
 def stop_wave_command(controller: CLI, field_name: str):
     """Stop waveform generation for a field."""
-    if not controller.ensure_configuration():
-        raise click.ClickException("CIP configuration failed.")
+    _require_configuration(controller)
     controller.stop_wave(field_name)
 
 
@@ -376,17 +455,14 @@ def cip_config_command(controller: CLI):
 
     default_selection = None
     current_config = getattr(controller.config_service, "cip_xml_path", None)
-
-    def _index_for(path_obj: Path):
-        try:
-            return xml_files.index(path_obj) + 1
-        except ValueError:
-            return None
+    # Keyed by str: both candidates below are already str(Path) values, so
+    # no Path objects need to be built or normalised for the lookups
+    selection_numbers = {str(path): number for number, path in enumerate(xml_files, start=1)}
 
     if current_config is not None:
-        default_selection = _index_for(Path(current_config))
+        default_selection = selection_numbers.get(str(current_config))
     if default_selection is None and controller.default_config_path:
-        default_selection = _index_for(Path(controller.default_config_path))
+        default_selection = selection_numbers.get(controller.default_config_path)
     if default_selection is None:
         default_selection = 1
 
@@ -403,7 +479,7 @@ def cip_config_command(controller: CLI):
         raise click.ClickException("CIP configuration failed.")
 
 
-@cli.command("test-net")
+@click.command("test-net")
 @click.option(
     "--target-ip",
     default=None,
@@ -426,7 +502,7 @@ def test_net_command(controller: CLI, target_ip: str, multicast_ip: str):
         raise click.ClickException("Network configuration failed.")
 
 
-@cli.command("set-net")
+@click.command("set-net")
 @click.option(
     "--target-ip",
     default=None,
@@ -441,11 +517,8 @@ def test_net_command(controller: CLI, target_ip: str, multicast_ip: str):
 def set_net_command(controller: CLI, target_ip: str, multicast_ip: str):
     """Update the stored network addresses and rerun network tests."""
 
-    updated_target_ip = target_ip or click.prompt(
-        "Target IP address", default=controller.target_ip, show_default=True
-    )
-    updated_multicast_ip = multicast_ip or click.prompt(
-        "Multicast group address", default=controller.multicast_ip, show_default=True
+    updated_target_ip, updated_multicast_ip = _prompt_net_addresses(
+        controller, target_ip=target_ip, multicast_ip=multicast_ip
     )
 
     if not controller.ensure_network_configuration(
@@ -467,7 +540,7 @@ def log_command(controller: CLI):
 @pass_controller
 def help_command(controller: CLI):
     """Display help information."""
-    controller.help_menu()
+    controller.help_menu(network_commands=ENABLE_NETWORK)
 
 
 @cli.command("cmd")
@@ -487,6 +560,11 @@ def cmd_shell(ctx):
 
 cli.add_command(stop_wave_command, name="stop-wave")
 
+# The network commands only exist when network testing is enabled
+if ENABLE_NETWORK:
+    cli.add_command(test_net_command)
+    cli.add_command(set_net_command)
+
 
 if __name__ == "__main__":
     cli()
@@ -2,10 +2,13 @@
 
 import logging
 import os
+import textwrap
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import click
 from scapy import all as scapy_all
@@ -24,6 +27,7 @@ from xcipmaster.fields import (
     FieldMutationError,
     WaveformError,
     WaveformManager,
+    packet_field,
 )
 from xcipmaster.network import NetworkCommandRunner, NetworkTestService
 from xcipmaster.paths import default_config_directory
@@ -31,14 +35,43 @@ from xcipmaster.paths import default_config_directory
 from .ui import UIUtilities
 
 
-log_dir = "./log"
-os.makedirs(log_dir, exist_ok=True)
+LOG_DIR = "./log"
+LOG_FILE = os.path.join(LOG_DIR, "app.log")
+LOG_LEVEL_ENV = "XCIPMASTER_LOG_LEVEL"
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    filename="./log/app.log",
-)
+# Rule printed between live_field_data refreshes
+SEPARATOR_LINE = "=" * 50
+
+
+def configure_logging(log_dir: str = LOG_DIR, level: Optional[int] = None) -> logging.Handler:
+    """Send application logs to ``app.log`` inside *log_dir*.
+
+    Nothing is configured at import time; the CLI entry point calls this so
+    library users keep control of their own logging.  When *level* is not
+    given it is read from ``XCIPMASTER_LOG_LEVEL`` and defaults to
+    ``WARNING``; the cyclic IO path logs every frame at ``DEBUG``.  Calling
+    it again for the same directory reuses the existing handler.
+    """
+
+    if level is None:
+        level = logging.getLevelName(os.environ.get(LOG_LEVEL_ENV, "WARNING").upper())
+        if not isinstance(level, int):
+            level = logging.WARNING
+
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.abspath(os.path.join(log_dir, "app.log"))
+
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == log_path:
+            break
+    else:
+        handler = logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+    root.setLevel(level)
+    return handler
 
 
 class CLI(UIUtilities):
@@ -52,6 +85,7 @@ class CLI(UIUtilities):
         field_formatter: Optional[FieldFormatter] = None,
         waveform_manager: Optional[WaveformManager] = None,
         test_mode: bool = False,
+        clock: Any = None,
     ):
         """Create a CLI controller with optional service overrides.
 
@@ -63,11 +97,13 @@ class CLI(UIUtilities):
         :func:`_initialize_controller`.  Communication tests can run the
         handshake and IO logic synchronously via
         :meth:`CommunicationManager.run_once` while injecting synchronous
-        factories.
+        factories.  ``clock`` provides the ``sleep`` used for the pauses
+        between console sections and defaults to the :mod:`time` module.
         """
 
         super().__init__()
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._clock = clock if clock is not None else time
 
         if config_service is None:
             config_service = CIPConfigService(logger=self.logger)
@@ -107,10 +143,24 @@ class CLI(UIUtilities):
         self.cip_test_flag = True
         self.logger.info("Initializing LoggedClass")
         self.time_zone = self.get_system_timezone()
+        # (epoch second, "dd/mm/YYYY HH:MM:SS") so get_timestamp only calls
+        # strftime when the second changes
+        self._timestamp_cache: tuple[Optional[int], str] = (None, "")
         self.test_mode = test_mode
         self.target_ip = "10.0.1.1"
         self.multicast_ip = "239.192.1.3"
         self.default_config_path = str(default_config_directory())
+        # (path, st_mtime_ns) of the last configuration ensure_configuration
+        # validated; a new mtime means the file changed and is reloaded
+        self._config_cache: dict[tuple[str, int], bool] = {}
+        # (folder, st_mtime_ns) -> XML files, refreshed when the folder changes
+        self._xml_file_cache: dict[tuple[str, int], list[Path]] = {}
+        # (packet class, subtype, show_spares) -> print_packet_fields rows;
+        # the grouping depends only on the class layout
+        self._field_table_cache: dict[tuple[Any, Optional[str], bool], list] = {}
+        self._field_names_cache: dict[type, tuple[str, ...]] = {}
+        self._preload_thread: Optional[threading.Thread] = None
+        self._preloaded_config = None
 
     @property
     def ot_packet(self):
@@ -169,7 +219,7 @@ class CLI(UIUtilities):
     
     
     def list_files_in_config_folder(self, config_folder: str):
-        xml_files = self.config_service.list_files_in_config_folder(config_folder)
+        xml_files = self._xml_files_in(config_folder)
 
         if not xml_files:
             click.echo("No files found in the config folder")
@@ -184,6 +234,18 @@ class CLI(UIUtilities):
         click.echo("")
         return list(xml_files)
 
+    def _xml_files_in(self, config_folder: str) -> list[Path]:
+        try:
+            cache_key = (str(config_folder), os.stat(config_folder).st_mtime_ns)
+        except OSError:
+            return list(self.config_service.list_files_in_config_folder(config_folder))
+
+        xml_files = self._xml_file_cache.get(cache_key)
+        if xml_files is None:
+            xml_files = list(self.config_service.list_files_in_config_folder(config_folder))
+            self._xml_file_cache = {cache_key: xml_files}
+        return xml_files
+
     def _resolve_cip_config_path(self, config_path: str):
         if hasattr(self.config_service, "resolve_cip_config_path"):
             resolved_path = self.config_service.resolve_cip_config_path(config_path)
@@ -195,6 +257,7 @@ class CLI(UIUtilities):
 
     def cip_config(self, config_path: str, *, force: bool = False):
         self.logger.info("Executing cip_config function")
+        self._config_cache.clear()
 
         click.echo("╔══════════════════════════════════════════╗")
         click.echo("║          CIP Configuration               ║")
@@ -209,21 +272,23 @@ class CLI(UIUtilities):
 
         resolved_path = Path(resolved_path_str)
 
-        current_path = getattr(self.config_service, "cip_xml_path", None)
-        overall_valid = getattr(self.config_service, "overall_cip_valid", False)
-        if (
-            not force
-            and current_path is not None
-            and current_path == resolved_path
-            and overall_valid
-        ):
-            click.echo(f"Using cached CIP configuration: {resolved_path}")
-            click.echo("")
-            self.cip_test_flag = True
-            self.default_config_path = str(resolved_path)
-            return True
+        result = self._take_preloaded_configuration(resolved_path)
+        if result is None:
+            current_path = getattr(self.config_service, "cip_xml_path", None)
+            overall_valid = getattr(self.config_service, "overall_cip_valid", False)
+            if (
+                not force
+                and current_path is not None
+                and current_path == resolved_path
+                and overall_valid
+            ):
+                click.echo(f"Using cached CIP configuration: {resolved_path}")
+                click.echo("")
+                self.cip_test_flag = True
+                self.default_config_path = str(resolved_path)
+                return True
 
-        result = self.config_service.load_configuration(str(resolved_path))
+            result = self.config_service.load_configuration(str(resolved_path))
         if not result.resolved_path:
             click.echo("Unable to load CIP configuration. Check the provided path.")
             click.echo("")
@@ -232,7 +297,7 @@ class CLI(UIUtilities):
 
         click.echo(f"Using CIP configuration: {result.resolved_path}")
         click.echo("")
-        time.sleep(0.1)
+        self._clock.sleep(0.1)
 
         click.echo("===== Testing CIP Configuration =====")
 
@@ -255,13 +320,35 @@ class CLI(UIUtilities):
         return False
 
     def ensure_configuration(self, config_path: Optional[str] = None, *, force: bool = False) -> bool:
-        """Ensure a CIP configuration is loaded, optionally from *config_path*."""
+        """Ensure a CIP configuration is loaded, optionally from *config_path*.
+
+        Repeated calls for an unchanged path cost a single ``stat``.
+        """
 
         path_to_use = config_path or self.default_config_path
         if not path_to_use:
             click.echo("No CIP configuration path available.")
             return False
 
+        cache_key = self._config_cache_key(path_to_use)
+        if not force and cache_key is not None and self._config_cache.get(cache_key):
+            return True
+        if cache_key is not None and any(path == cache_key[0] for path, _ in self._config_cache):
+            # Modified on disk since it was validated
+            force = True
+
+        valid = self._ensure_configuration(path_to_use, force=force)
+        self._config_cache = {cache_key: True} if valid and cache_key is not None else {}
+        return valid
+
+    @staticmethod
+    def _config_cache_key(config_path: str) -> Optional[tuple[str, int]]:
+        try:
+            return (config_path, os.stat(config_path).st_mtime_ns)
+        except OSError:
+            return None
+
+    def _ensure_configuration(self, path_to_use: str, *, force: bool) -> bool:
         resolved_path_str = self._resolve_cip_config_path(path_to_use)
         if resolved_path_str is None:
             return False
@@ -272,6 +359,7 @@ class CLI(UIUtilities):
 
         if (
             not force
+            and self._preload_thread is None
             and current_path is not None
             and current_path == resolved_path
             and overall_valid
@@ -280,6 +368,40 @@ class CLI(UIUtilities):
 
         return self.cip_config(str(resolved_path), force=force)
 
+    def preload_configuration(self, config_path: Optional[str] = None) -> None:
+        """Start loading *config_path* (default: the default path) in the background.
+
+        The next :meth:`cip_config` for the same file reports this result
+        instead of loading it again, so the XML parsing overlaps with whatever
+        the caller does meanwhile, such as the start-up progress bar.
+        """
+
+        path = config_path or self.default_config_path
+        if not path or self._preload_thread is not None:
+            return
+
+        def load():
+            try:
+                self._preloaded_config = self.config_service.load_configuration(path)
+            except Exception:  # pragma: no cover - defensive
+                self.logger.exception("Unable to preload CIP configuration %s", path)
+
+        self._preload_thread = threading.Thread(
+            target=load, name="CIPConfigPreload", daemon=True
+        )
+        self._preload_thread.start()
+
+    def _take_preloaded_configuration(self, resolved_path: Path):
+        thread, self._preload_thread = self._preload_thread, None
+        if thread is None:
+            return None
+        thread.join()
+
+        result, self._preloaded_config = self._preloaded_config, None
+        if result is None or result.resolved_path != resolved_path:
+            return None
+        return result
+
     def config_network(self, target_ip: str, multicast_ip: str):
         self.logger.info("Executing config_network function")
         click.echo("╔══════════════════════════════════════════╗")
@@ -287,7 +409,7 @@ class CLI(UIUtilities):
         click.echo("╚══════════════════════════════════════════╝")
         click.echo("")
 
-        time.sleep(0.1)
+        self._clock.sleep(0.1)
 
         result = self.network_service.configure(target_ip, multicast_ip)
 
@@ -297,7 +419,7 @@ class CLI(UIUtilities):
             click.echo(f"Multicast group address: {result.multicast_ip}")
 
         click.echo("\n===== Testing Communication with Target =====")
-        time.sleep(1)
+        self._clock.sleep(1)
 
         table_data = [["Communication Test Result", "Status"]]
         table_data.extend(result.tests)
@@ -305,7 +427,7 @@ class CLI(UIUtilities):
         click.echo("")
 
         if result.success:
-            time.sleep(0.1)
+            self._clock.sleep(0.1)
             self.target_ip = target_ip
             self.multicast_ip = multicast_ip
             return True
@@ -350,7 +472,7 @@ class CLI(UIUtilities):
             
             
     ############ Help Menu ############ 
-    def help_menu(self):
+    def help_menu(self, network_commands=True):
         self.logger.info("Executing help_menu function")
         click.echo("\nAvailable commands:")
         
@@ -370,8 +492,13 @@ class CLI(UIUtilities):
             ("box <name> <max_val> <min_val> <period(ms)> <duty_cycle>", "Wave a field value with a square/rectangular waveform"),
             ("live <refresh_rate(ms)>", "Display real-time field data of the specified packet class"),
             ("cip-config", "Select and validate a CIP configuration file"),
-            ("test-net --target-ip <ip> --multicast-ip <ip>", "Run network configuration tests"),
-            ("set-net [--target-ip <ip>] [--multicast-ip <ip>]", "Update stored network addresses and rerun tests"),
+        ]
+        if network_commands:
+            commands += [
+                ("test-net --target-ip <ip> --multicast-ip <ip>", "Run network configuration tests"),
+                ("set-net [--target-ip <ip>] [--multicast-ip <ip>]", "Update stored network addresses and rerun tests"),
+            ]
+        commands += [
             ("log", "Print the recent 100 log events"),
             ("exit", "Exit the application"),
             ("help", "Display this help menu")
@@ -389,26 +516,26 @@ class CLI(UIUtilities):
     ###-------------------------------------------------------------###
 
     def _resolve_packet_for_field(self, field_name):
-        if hasattr(self.ot_packet.__class__, field_name):
+        if packet_field(self.ot_packet, field_name) is not None:
             return self.ot_packet, "OT_EO"
-        if hasattr(self.to_packet.__class__, field_name):
+        if packet_field(self.to_packet, field_name) is not None:
             return self.to_packet, "TO"
         return None, None
 
     def MPU_heartbeat(self, field_name,field_value):
         self.logger.info("MPU_HeartBeat function executing")
-        self.logger.info(f"field name:{field_name}")
-        self.logger.info(f"field value:{field_value}")
+        self.logger.info("field name:%s", field_name)
+        self.logger.info("field value:%s", field_value)
         
-        if hasattr(self.ot_packet,field_name):
-            field = getattr(self.ot_packet.__class__, field_name)
+        field = packet_field(self.ot_packet, field_name)
+        if field is not None:
             if isinstance(field, scapy_all.ByteField):
                     setattr(self.ot_packet, field_name, field_value)
                     self.logger.info("MPU_HeartBeat set")
             else:
                 self.logger.warning("Heartbeat is not ByteField type")
         else:
-            self.logger.warning(f"There is no HearBeat with the name: {field_name}")
+            self.logger.warning("There is no HearBeat with the name: %s", field_name)
 
     
     def set_field(self, field_name, field_value):
@@ -429,6 +556,50 @@ class CLI(UIUtilities):
         print(f"Set {field_name} to {field_value}")
         return True
 
+    def set_fields(self, updates):
+        """Set several fields while taking the comm lock only once.
+
+        ``updates`` maps field names to raw values as accepted by
+        :meth:`set_field`. Every name is resolved before anything changes,
+        and either all fields are updated or none are.
+        """
+
+        self.logger.info("Executing set_fields function")
+        packet_updates = {}
+        for field_name, field_value in updates.items():
+            packet, subtype = self._resolve_packet_for_field(field_name)
+            if packet is None:
+                print(f"Field {field_name} not found.")
+                return False
+            packet_updates.setdefault(subtype, (packet, {}))[1][field_name] = field_value
+
+        for field_name in updates:
+            self.stop_wave(field_name)
+
+        try:
+            with self.lock:
+                previous = [
+                    (packet, field_name, getattr(packet, field_name))
+                    for packet, values in packet_updates.values()
+                    for field_name in values
+                ]
+                try:
+                    for packet, values in packet_updates.values():
+                        self.field_mutator.set_values(packet, values)
+                except FieldMutationError:
+                    # set_values restores its own packet; undo the packets
+                    # already updated before it
+                    for packet, field_name, value in previous:
+                        setattr(packet, field_name, value)
+                    raise
+        except FieldMutationError as exc:
+            print(str(exc))
+            return False
+
+        for field_name, field_value in updates.items():
+            print(f"Set {field_name} to {field_value}")
+        return True
+
     def clear_field(self, field_name):
         self.logger.info("Executing clear_field function")
         self.stop_wave(field_name)
@@ -535,15 +706,26 @@ class CLI(UIUtilities):
     def get_big_endian_value(self, packet, field_name):
         return self.field_formatter.format_value(packet, field_name)
 
+    def _field_names(self, packet):
+        # fields_desc is fixed per packet class, so the names are collected
+        # once per class rather than on every live refresh
+        packet_class = type(packet)
+        names = self._field_names_cache.get(packet_class)
+        if names is None:
+            names = tuple(
+                field.name
+                for field in getattr(packet, "fields_desc", [])
+                if getattr(field, "name", "")
+            )
+            self._field_names_cache[packet_class] = names
+        return names
+
     def _format_packet_fields(self, packet):
         if packet is None:
             return []
 
         formatted = []
-        for field in getattr(packet, "fields_desc", []):
-            name = getattr(field, "name", "")
-            if not name:
-                continue
+        for name in self._field_names(packet):
             try:
                 value = self.field_formatter.format_value(packet, name)
                 display = self.decrease_font_size(str(value))
@@ -568,7 +750,11 @@ class CLI(UIUtilities):
             click.echo(f"{label} Packet Header and Payload:")
 
             try:
-                hexdump_output = scapy_all.hexdump(packet, dump=True)
+                # Serialise under the comm lock so the frame is consistent,
+                # then format the snapshot without holding it
+                with self.lock:
+                    frame = bytes(packet)
+                hexdump_output = scapy_all.hexdump(frame, dump=True)
             except Exception as exc:  # pragma: no cover - defensive fallback
                 self.logger.exception("Failed to render %s packet", label)
                 click.echo(f"Unable to display {label} packet: {exc}")
@@ -579,6 +765,23 @@ class CLI(UIUtilities):
             click.echo("")
 
     def print_packet_fields(self, title, packet, show_spares=False, subtype=None):
+        cache_key = (type(packet), subtype, show_spares)
+        packet_table = self._field_table_cache.get(cache_key)
+        if packet_table is None:
+            packet_table = self._field_table_rows(packet, show_spares, subtype)
+            if packet is not None:
+                self._field_table_cache[cache_key] = packet_table
+
+        table_width = 100
+
+        headers = ["Field Type", "Field Names"]
+        colalign = ["left", "left"]
+        title_header = f"{title}:"
+        click.echo(title_header.center(table_width))
+        click.echo(tabulate(packet_table, headers=headers, colalign=colalign, tablefmt="fancy_grid"))
+        click.echo("")
+
+    def _field_table_rows(self, packet, show_spares, subtype):
         # Organizing fields by type for the given packet
         fields_by_type = {}
 
@@ -604,30 +807,17 @@ class CLI(UIUtilities):
             field_names = [name for name in field_names if name]
             field_str = ", ".join(field_names)
             if len(field_str) > 100:
-                field_str = ""
-                curr_len = 0
-                for name in field_names:
-                    if curr_len + len(name) + 2 > 100:
-                        field_str += "\n" + name + ", "
-                        curr_len = len(name) + 2
-                    else:
-                        field_str += name + ", "
-                        curr_len += len(name) + 2
-                field_str = field_str.rstrip(", ")
+                field_str = "\n".join(
+                    textwrap.wrap(
+                        field_str, width=100, break_long_words=False, break_on_hyphens=False
+                    )
+                )
 
             packet_table.append([field_type, field_str])
 
         if not show_spares:
             packet_table = [row for row in packet_table if not row[0].startswith("spare_")]
-
-        table_width = 100
-
-        headers = ["Field Type", "Field Names"]
-        colalign = ["left", "left"]
-        title_header = f"{title}:"
-        click.echo(title_header.center(table_width))
-        click.echo(tabulate(packet_table, headers=headers, colalign=colalign, tablefmt="fancy_grid"))
-        click.echo("")
+        return packet_table
         
     def list_fields(self):
         self.logger.info("Executing list_fields function")
@@ -647,10 +837,16 @@ class CLI(UIUtilities):
         return timezone
     
     def get_timestamp(self):
-        # Get the current timestamp in the desired format
-        timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S:%f")[:-3]  # Remove microseconds
+        # Get the current timestamp in the desired format, with milliseconds
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = self._timestamp_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).strftime("%d/%m/%Y %H:%M:%S")
+            self._timestamp_cache = (second, prefix)
+        milliseconds = int((now - second) * 1000)
         location_code = self.time_zone
-        return f"{timestamp} {location_code}"
+        return f"{prefix}:{milliseconds:03d} {location_code}"
     
     def decrease_font_size(self, text):
         # Add special characters or spaces to decrease font size
@@ -662,27 +858,62 @@ class CLI(UIUtilities):
         self.logger.info("Executing live_field_data function")
         refresh_rate = float(refresh_ms)
         click.echo("")
+        # Last rendered rows and table per packet; tabulate only reruns when
+        # a displayed value changed
+        rows_OT = rows_TO = None
+        table_OT = table_TO = ""
+        # Title lines are rebuilt only when a packet's class changes
+        class_OT = class_TO = None
+        title_OT = title_TO = ""
+        # Sleep to a monotonic schedule so per-tick work does not stretch the
+        # refresh period
+        monotonic = getattr(self._clock, "monotonic", time.monotonic)
+        period = refresh_rate / 1000
+        next_tick = monotonic() + period
         try:
             while True:
-                # Print timestamp
-                print(*"=" * 50, sep="")
-                click.echo("")
                 timestamp = self.get_timestamp()
-                click.echo(tabulate([[timestamp]], headers=["Timestamp", ""], tablefmt="fancy_grid"))
-                
-                class_name_OT = self.ot_packet.__class__.__name__
-                field_data_OT = self._format_packet_fields(self.ot_packet)
-                click.echo(f"\t\t\t {class_name_OT} \t\t\t")
-                click.echo(tabulate(field_data_OT, headers=["Field Name", "Field Value"], tablefmt="fancy_grid"))
-                click.echo("")
 
-                class_name_TO = self.to_packet.__class__.__name__
-                field_data_TO = self._format_packet_fields(self.to_packet)
-                click.echo(f"\t\t\t {class_name_TO} \t\t\t")
-                click.echo(tabulate(field_data_TO, headers=["Field Name", "Field Value"], tablefmt="fancy_grid"))
-                time.sleep(refresh_rate/1000)  # Adjust the delay as needed for real-time display
-                click.echo("")
-                print(*"=" * 50, sep="")
+                ot_packet = self.ot_packet
+                if type(ot_packet) is not class_OT:
+                    class_OT = type(ot_packet)
+                    title_OT = f"\t\t\t {class_OT.__name__} \t\t\t"
+                field_data_OT = self._format_packet_fields(ot_packet)
+                if field_data_OT != rows_OT:
+                    rows_OT = field_data_OT
+                    table_OT = tabulate(field_data_OT, headers=["Field Name", "Field Value"], tablefmt="fancy_grid")
+
+                to_packet = self.to_packet
+                if type(to_packet) is not class_TO:
+                    class_TO = type(to_packet)
+                    title_TO = f"\t\t\t {class_TO.__name__} \t\t\t"
+                field_data_TO = self._format_packet_fields(to_packet)
+                if field_data_TO != rows_TO:
+                    rows_TO = field_data_TO
+                    table_TO = tabulate(field_data_TO, headers=["Field Name", "Field Value"], tablefmt="fancy_grid")
+
+                # Write the whole frame in one call rather than line by line
+                click.echo(
+                    "\n".join(
+                        (
+                            SEPARATOR_LINE,
+                            "",
+                            tabulate([[timestamp]], headers=["Timestamp", ""], tablefmt="fancy_grid"),
+                            title_OT,
+                            table_OT,
+                            "",
+                            title_TO,
+                            table_TO,
+                            "",
+                            SEPARATOR_LINE,
+                        )
+                    )
+                )
+                now = monotonic()
+                if next_tick < now:
+                    next_tick = now  # fell behind; drop the missed ticks
+                self._clock.sleep(next_tick - now)
+                next_tick += period
         except KeyboardInterrupt:
             print("\nExiting live field data display...")
             return
@@ -693,13 +924,12 @@ class CLI(UIUtilities):
     ########################################################################
 
     def print_last_logs(self):
-        log_file_path = "./log/app.log"
-        if os.path.exists(log_file_path):
-            with open(log_file_path, "r") as log_file:
-                lines = log_file.readlines()
-                last_100_lines = lines[-100:]
-                click.echo("Last 100 lines of app.log:")
-                for line in last_100_lines:
-                    click.echo(line.strip())
+        if os.path.exists(LOG_FILE):
+            # Stream the file, keeping only the tail in memory
+            with open(LOG_FILE, "r") as log_file:
+                last_100_lines = deque(log_file, maxlen=100)
+            click.echo("Last 100 lines of app.log:")
+            if last_100_lines:
+                click.echo("\n".join(line.strip() for line in last_100_lines))
     
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import calendar
 import logging
+import socket
 import threading
 import time
 from typing import Any, Callable, Optional
@@ -11,12 +12,15 @@ from thirdparty.scapy_cip_enip.tgv2020 import Client
 from scapy import all as scapy_all
 
 from .config import CIPConfigService
+from .fields import packet_field
 from .network import NetworkTestService
 
 
 ClientFactory = Callable[..., Any]
 ThreadFactory = Callable[..., threading.Thread]
 
+CLIENT_SOCKET_ATTRIBUTES = ("Sock", "MulticastSock", "Sock1")
+
 
 def default_client_factory(
     *,
@@ -60,6 +64,9 @@ class CommunicationManager:
         self.network_service = network_service
         self.lock = threading.Lock()
         self.stop_comm_events = threading.Event()
+        # Set while no communication thread is running
+        self.comm_thread_stopped = threading.Event()
+        self.comm_thread_stopped.set()
         self.start_comm_thread_instance: Optional[threading.Thread] = None
         self.enable_auto_reconnect = False
         self.clMPU_CIP_Server = None
@@ -101,17 +108,25 @@ class CommunicationManager:
             pkgCIP_IO = clMPU_CIP_Server.recv_UDP_ENIP_CIP_IO(False, 0.5)
 
             if pkgCIP_IO is not None:
-                self.logger.info("manage_io_communication: Detected incoming stream")
+                self.logger.debug("manage_io_communication: Detected incoming stream")
 
+                payload = pkgCIP_IO.payload.load
                 self.lock.acquire()
-                self.config_service.TO_packet = self.config_service.TO_packet_class(
-                    (pkgCIP_IO.payload.load)
-                )
+                # Only dissect frames whose bytes changed. Scapy clears
+                # raw_packet_cache when a field is edited, so a locally
+                # modified TO packet is still replaced by the next frame.
+                to_packet = self.config_service.TO_packet
+                to_packet_class = self.config_service.TO_packet_class
+                if (
+                    type(to_packet) is not to_packet_class
+                    or getattr(to_packet, "raw_packet_cache", None) != payload
+                ):
+                    self.config_service.TO_packet = to_packet_class(payload)
                 self.lock.release()
 
                 self.lock.acquire()
                 if self.config_service.TO_packet is not None:
-                    self.logger.info("manage_io_communication: Parsed TO packet data")
+                    self.logger.debug("manage_io_communication: Parsed TO packet data")
                     if MPU_CTCMSAlive >= 255:
                         MPU_CTCMSAlive = 0
                     else:
@@ -119,7 +134,7 @@ class CommunicationManager:
 
                     self._set_heartbeat("MPU_CTCMSAlive", MPU_CTCMSAlive)
 
-                    if hasattr(self.config_service.OT_packet, "MPU_CDateTimeSec"):
+                    if packet_field(self.config_service.OT_packet, "MPU_CDateTimeSec") is not None:
                         setattr(
                             self.config_service.OT_packet,
                             "MPU_CDateTimeSec",
@@ -171,6 +186,12 @@ class CommunicationManager:
             return
 
         def start_comm_thread():
+            try:
+                run_comm_thread()
+            finally:
+                self.comm_thread_stopped.set()
+
+        def run_comm_thread():
             while self.enable_auto_reconnect or not self.stop_comm_events.is_set():
                 try:
                     self.logger.info("Executing start communication thread")
@@ -200,6 +221,7 @@ class CommunicationManager:
             self.logger.info("start: Thread has finished execution")
 
         self.stop_comm_events.clear()
+        self.comm_thread_stopped.clear()
         try:
             thread = self.thread_factory(
                 target=start_comm_thread,
@@ -286,10 +308,9 @@ class CommunicationManager:
         packet = self.config_service.OT_packet
         if packet is None:
             return
-        if hasattr(packet, field_name):
-            field = getattr(packet.__class__, field_name)
-            if isinstance(field, scapy_all.ByteField):
-                setattr(packet, field_name, field_value)
+        field = packet_field(packet, field_name)
+        if isinstance(field, scapy_all.ByteField):
+            setattr(packet, field_name, field_value)
 
     def enable_auto(self):
         self.logger.info("Automatic communication enabled")
@@ -305,6 +326,7 @@ class CommunicationManager:
         if self.stop_comm_events is not None:
             self.stop_comm_events.set()
 
+        client = self.clMPU_CIP_Server
         try:
             if self.clMPU_CIP_Server is not None:
                 try:
@@ -313,23 +335,33 @@ class CommunicationManager:
                 except Exception as exc:
                     self.logger.error("Error closing CIP connection: %s", exc)
 
-                try:
-                    self.clMPU_CIP_Server.close()
-                    self.logger.info("Server connection closed successfully")
-                except Exception as exc:
-                    self.logger.error("Error closing server connection: %s", exc)
-
             if (
                 self.start_comm_thread_instance is not None
                 and self.start_comm_thread_instance.is_alive()
             ):
                 self.start_comm_thread_instance.join(timeout=5)
                 if self.start_comm_thread_instance.is_alive():
-                    self.logger.warning("Communication thread did not stop within timeout")
+                    # The sockets are still open here; shutdown() on a closed
+                    # socket fails with EBADF and leaves recv() blocked
+                    self.logger.warning(
+                        "Communication thread did not stop within timeout; forcing socket shutdown"
+                    )
+                    self._shutdown_client_sockets(client)
+                    self.start_comm_thread_instance.join(timeout=1)
+
+                if self.start_comm_thread_instance.is_alive():
+                    self.logger.warning("Communication thread did not stop after socket shutdown")
                 else:
                     self.logger.info("Communication thread stopped successfully")
                     self.start_comm_thread_instance = None
 
+            if client is not None:
+                try:
+                    client.close()
+                    self.logger.info("Server connection closed successfully")
+                except Exception as exc:
+                    self.logger.error("Error closing server connection: %s", exc)
+
             self.logger.info("Communication thread stopped")
         except Exception as exc:  # pragma: no cover - defensive
             self.logger.error("Unexpected error while stopping communication: %s", exc)
@@ -342,6 +374,21 @@ class CommunicationManager:
             else:
                 self.start_comm_thread_instance = None
 
+    def _shutdown_client_sockets(self, client) -> None:
+        """Shut down *client*'s sockets so blocking calls in the IO thread return."""
+
+        if client is None:
+            return
+
+        for attribute in CLIENT_SOCKET_ATTRIBUTES:
+            sock = getattr(client, attribute, None)
+            if sock is None or not hasattr(sock, "shutdown"):
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError as exc:
+                self.logger.debug("Unable to shut down %s: %s", attribute, exc)
+
 
 __all__ = [
     "CommunicationManager",
@@ -2,14 +2,84 @@
 from __future__ import annotations
 
 import logging
+import sys
+import threading
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple, Type
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
 
 from scapy import all as scapy_all
 
 
+# Size in bytes of one element of each CIP data type
+CIP_DATA_TYPE_SIZE: Dict[str, int] = {
+    "usint": 1,
+    "uint": 2,
+    "udint": 4,
+    "real": 4,
+    "string": 1,
+    "sint": 1,
+    "int": 2,
+    "dint": 4,
+    "lreal": 8,
+    "lint": 8,
+}
+
+# Scapy field constructor for each supported CIP data type, called with the
+# field id and length. Types without an entry are left out of the packet.
+FIELD_FACTORIES: Dict[str, Callable[[str, int], scapy_all.Field]] = {
+    "usint": lambda field_id, length: scapy_all.ByteField(field_id, 0),
+    "bool": lambda field_id, length: scapy_all.BitField(field_id, 0, 1),
+    "real": lambda field_id, length: scapy_all.IEEEFloatField(field_id, 0),
+    "string": lambda field_id, length: scapy_all.StrFixedLenField(
+        field_id, b"", length=int(length)
+    ),
+    "udint": lambda field_id, length: scapy_all.LEIntField(field_id, 0),
+    "uint": lambda field_id, length: scapy_all.ShortField(field_id, 0),
+    "sint": lambda field_id, length: scapy_all.SignedByteField(field_id, 0),
+}
+
+
+# Interned spare field names indexed by byte (and bit), grown on demand so
+# every assembly and reload shares one string per spare slot
+_SPARE_BYTE_NAMES: List[str] = []
+_SPARE_BIT_NAMES: List[Tuple[str, ...]] = []
+_SPARE_NAMES_LOCK = threading.Lock()
+
+
+def _reserve_spare_names(byte_count: int) -> None:
+    if len(_SPARE_BYTE_NAMES) >= byte_count:
+        return
+    with _SPARE_NAMES_LOCK:
+        for byte_index in range(len(_SPARE_BYTE_NAMES), byte_count):
+            _SPARE_BIT_NAMES.append(
+                tuple(sys.intern(f"spare_bit_{byte_index}_{bit_index}") for bit_index in range(8))
+            )
+            _SPARE_BYTE_NAMES.append(sys.intern(f"spare_byte_{byte_index}"))
+
+
+@lru_cache(maxsize=64)
+def _build_packet_class(
+    class_name: str, field_spec: Tuple[Tuple[str, str, int], ...]
+) -> Type[scapy_all.Packet]:
+    """Return the Packet subclass for ``(id, type, length)`` field specs.
+
+    Reloading a configuration, or an identical assembly in another file,
+    reuses the class built the first time.
+    """
+
+    field_desc = []
+    for field_id, field_type, field_length in field_spec:
+        factory = FIELD_FACTORIES.get(field_type)
+        if factory is not None:
+            field_desc.append(factory(field_id, field_length))
+
+    return type(class_name, (scapy_all.Packet,), {"name": class_name, "fields_desc": field_desc})
+
+
 @dataclass
 class PacketLayout:
     """Description of a dynamically generated packet class."""
@@ -219,72 +289,48 @@ class CIPConfigService:
         max_packet_size_bits = assembly_size
         self.logger.info("Create_Packet_Dictionary()")
         signals = {}
+        _reserve_spare_names(max_packet_size_bits // 8)
 
-        cip_data_type_size = {
-            "usint": 1,
-            "uint": 2,
-            "udint": 4,
-            "real": 4,
-            "string": 1,
-            "sint": 1,
-            "int": 2,
-            "dint": 4,
-            "lreal": 8,
-            "lint": 8,
-        }
-
-        fields_dict.sort(key=lambda item: item["offset"])
+        fields_dict.sort(key=itemgetter("offset"))
         self.logger.info("create_packet_dict: Sorted Fields")
 
-        sorted_dict = {}
-        for item in fields_dict:
-            sorted_dict[item["id"]] = {
-                "offset": item["offset"],
-                "type": item["type"],
-                "length": item["length"],
-            }
-
-        for field_id, field_info in sorted_dict.items():
-            offset = field_info["offset"]
-            field_type = field_info["type"]
+        # First non-bool field starting at each bit offset, so the byte loop
+        # below does a dict lookup instead of rescanning every field
+        byte_fields = {}
+        # Keyed by id so a repeated id keeps its first position with its
+        # last definition; the entries are shared, not copied
+        for item in {item["id"]: item for item in fields_dict}.values():
+            offset = item["offset"]
+            field_type = item["type"]
             byte_index = offset // 8
             signals.setdefault(byte_index, [])
             if field_type == "bool":
                 signals[byte_index].append(
                     {
-                        "id": field_id,
+                        "id": item["id"],
                         "offset": offset,
                         "type": "bool",
                         "length": 1,
                     }
                 )
+            else:
+                byte_fields.setdefault(offset, (item["id"], field_type, item["length"]))
 
-        len_counter = 0
         temp_pad_index = 0
         temp_pad_len = 0
-        for byte_index in range(max_packet_size_bits // 8):
-            if len_counter != 0:
-                len_counter -= 1
-                continue
-
+        byte_count = max_packet_size_bits // 8
+        byte_index = 0
+        while byte_index < byte_count:
             pack = signals.get(byte_index, [])
             if not pack:
                 signals[byte_index] = []
-                field_data = None
-                for field_id, field_info in sorted_dict.items():
-                    if field_info["offset"] == byte_index * 8 and field_info["type"] != "bool":
-                        field_data = (
-                            field_id,
-                            field_info["type"],
-                            field_info["length"],
-                        )
-                        break
+                field_data = byte_fields.get(byte_index * 8)
 
                 if field_data:
                     if temp_pad_len > 0:
                         signals[temp_pad_index].append(
                             {
-                                "id": f"spare_byte_{temp_pad_index}",
+                                "id": _SPARE_BYTE_NAMES[temp_pad_index],
                                 "offset": temp_pad_index * 8,
                                 "type": "string",
                                 "length": temp_pad_len,
@@ -302,10 +348,12 @@ class CIPConfigService:
                             "length": field_length,
                         }
                     )
-                    len_counter_field_size = cip_data_type_size.get(field_type, 1)
-                    len_counter = field_length * len_counter_field_size - 1
+                    # Jump past the bytes the field covers; they get no
+                    # entries of their own
+                    field_size = field_length * CIP_DATA_TYPE_SIZE.get(field_type, 1)
+                    byte_index += max(field_size, 1)
+                    continue
                 else:
-                    len_counter = 0
                     if temp_pad_len == 0:
                         temp_pad_index = byte_index
                     temp_pad_len += 1
@@ -313,7 +361,7 @@ class CIPConfigService:
                 if temp_pad_len > 0:
                     signals[temp_pad_index].append(
                         {
-                            "id": f"spare_byte_{temp_pad_index}",
+                            "id": _SPARE_BYTE_NAMES[temp_pad_index],
                             "offset": temp_pad_index * 8,
                             "type": "string",
                             "length": temp_pad_len,
@@ -322,24 +370,30 @@ class CIPConfigService:
                     temp_pad_len = 0
                     temp_pad_index = 0
 
-                occupied_offsets = {signal["offset"] % 8 for signal in pack}
-                for bit_index in range(8):
-                    if bit_index not in occupied_offsets:
-                        bit_offset = byte_index * 8 + bit_index
-                        signals[byte_index].append(
-                            {
-                                "id": f"spare_bit_{byte_index}_{bit_index}",
-                                "offset": bit_offset,
-                                "type": "bool",
-                                "length": 1,
-                            }
-                        )
+                # Bitmask of the unused bits in this byte; only those are
+                # visited, lowest first
+                free = 0xFF
+                for signal in pack:
+                    free &= ~(1 << (signal["offset"] & 7))
+                while free:
+                    bit_index = (free & -free).bit_length() - 1
+                    free &= free - 1
+                    signals[byte_index].append(
+                        {
+                            "id": _SPARE_BIT_NAMES[byte_index][bit_index],
+                            "offset": byte_index * 8 + bit_index,
+                            "type": "bool",
+                            "length": 1,
+                        }
+                    )
                 signals[byte_index].sort(key=lambda x: x["offset"])
 
+            byte_index += 1
+
         if temp_pad_len > 0:
             signals[temp_pad_index].append(
                 {
-                    "id": f"spare_byte_{temp_pad_index}",
+                    "id": _SPARE_BYTE_NAMES[temp_pad_index],
                     "offset": temp_pad_index * 8,
                     "type": "string",
                     "length": temp_pad_len,
@@ -350,19 +404,11 @@ class CIPConfigService:
 
     def sorted_fields(self, packet):
         self.logger.info("sorted_fields()")
-        fields = []
-        for _, signals in packet.items():
-            for signal in signals:
-                fields.append(
-                    {
-                        "id": signal["id"],
-                        "offset": signal["offset"],
-                        "type": signal["type"],
-                        "length": signal["length"],
-                    }
-                )
-
-        fields = sorted(fields, key=lambda x: x["offset"])
+        # The signal dicts already carry exactly id/offset/type/length, so
+        # they are shared rather than copied; get_field_metadata hands out
+        # copies to callers.
+        fields = [signal for signals in packet.values() for signal in signals]
+        fields.sort(key=itemgetter("offset"))
         return fields
 
     def create_packet_class(self, assembly_element):
@@ -388,29 +434,8 @@ class CIPConfigService:
 
         byte_packet_field = self.create_packet_dict(fields_dict, assembly_size)
         sorted_field = self.sorted_fields(byte_packet_field)
-        field_desc = []
-
-        for field in sorted_field:
-            field_id = field["id"]
-            field_type = field["type"]
-            field_length = field["length"]
-
-            if field_type == "usint":
-                field_desc.append(scapy_all.ByteField(field_id, 0))
-            elif field_type == "bool":
-                field_desc.append(scapy_all.BitField(field_id, 0, 1))
-            elif field_type == "real":
-                field_desc.append(scapy_all.IEEEFloatField(field_id, 0))
-            elif field_type == "string":
-                field_desc.append(scapy_all.StrFixedLenField(field_id, b"", int(field_length)))
-            elif field_type == "udint":
-                field_desc.append(scapy_all.LEIntField(field_id, 0))
-            elif field_type == "uint":
-                field_desc.append(scapy_all.ShortField(field_id, 0))
-            elif field_type == "sint":
-                field_desc.append(scapy_all.SignedByteField(field_id, 0))
-
-        dynamic_packet_class = type(class_name, (scapy_all.Packet,), {"name": class_name, "fields_desc": field_desc})
+        field_spec = tuple((field["id"], field["type"], field["length"]) for field in sorted_field)
+        dynamic_packet_class = _build_packet_class(class_name, field_spec)
         return PacketLayout(
             name=class_name,
             subtype=subtype,
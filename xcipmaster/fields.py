@@ -7,7 +7,7 @@ import struct
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 
 from scapy import all as scapy_all
 
@@ -39,15 +39,42 @@ class FieldStrategy:
 
 
 def _reverse_bytes(value: int, length: int) -> int:
-    raw = int(value)
-    byte_array = raw.to_bytes(length, byteorder="big", signed=False)
-    return int.from_bytes(byte_array[::-1], byteorder="big", signed=False)
+    # Writing little-endian and reading big-endian swaps the bytes in one
+    # pass, without a reversed copy of the buffer.
+    raw = int(value).to_bytes(length, byteorder="little", signed=False)
+    return int.from_bytes(raw, byteorder="big", signed=False)
+
+
+# Packing with one byte order and unpacking with the other swaps the bytes
+# without an intermediate reversed copy.
+_FLOAT32_LE = struct.Struct("<f")
+_FLOAT32_BE = struct.Struct(">f")
 
 
 def _float_to_big_endian(value: float) -> float:
-    byte_array = struct.pack("f", float(value))
-    reversed_byte_array = byte_array[::-1]
-    return struct.unpack("f", reversed_byte_array)[0]
+    return _FLOAT32_BE.unpack(_FLOAT32_LE.pack(float(value)))[0]
+
+
+def packet_field(packet: Any, field_name: str) -> Any:
+    """Return the field descriptor named ``field_name`` on ``packet``'s class.
+
+    Scapy resolves field names on a packet class by scanning ``fields_desc``
+    on every access, so each class gets a name index the first time it is
+    queried. Returns ``None`` when ``packet`` is ``None`` or its class has no
+    such attribute.
+    """
+
+    if packet is None:
+        return None
+    packet_class = packet.__class__
+    index = packet_class.__dict__.get("_xcip_field_index")
+    if index is None:
+        index = {field.name: field for field in getattr(packet_class, "fields_desc", ())}
+        setattr(packet_class, "_xcip_field_index", index)
+    field = index.get(field_name)
+    if field is None:
+        field = getattr(packet_class, field_name, None)
+    return field
 
 
 def _parse_int(value: Any) -> int:
@@ -78,7 +105,7 @@ def _ensure_range(value: int, minimum: int, maximum: int, *, field_name: str) ->
 
 
 def _string_to_bytes(packet: Any, field_name: str, raw_value: Any) -> bytes:
-    field = getattr(packet.__class__, field_name)
+    field = packet_field(packet, field_name)
     if isinstance(raw_value, bytes):
         field_bytes = raw_value
     elif isinstance(raw_value, str):
@@ -162,7 +189,6 @@ def _set_short(packet: Any, field_name: str, raw_value: Any) -> int:
 def _set_le_short(packet: Any, field_name: str, raw_value: Any) -> Any:
     value = _parse_int(raw_value)
     int_value = _ensure_range(value, 0, 0xFFFF, field_name=field_name)
-    field = getattr(packet.__class__, field_name)
     if isinstance(raw_value, str) and raw_value.strip().lower().startswith("0x"):
         stored_value = int_value.to_bytes(2, byteorder="big", signed=False)
     else:
@@ -238,17 +264,61 @@ DEFAULT_FIELD_STRATEGIES: Dict[type, FieldStrategy] = {
 }
 
 
+def _strategy_for(
+    strategies: Dict[type, FieldStrategy], field_type: type
+) -> Optional[FieldStrategy]:
+    """Return the strategy for *field_type* or its most specific registered base.
+
+    Walking the MRO makes an exact match a single dict lookup and lets a
+    subclass entry (``StrFixedLenField``) win over its base (``StrField``)
+    regardless of registration order.
+    """
+
+    for base in field_type.__mro__:
+        strategy = strategies.get(base)
+        if strategy is not None:
+            return strategy
+    return None
+
+
 class FieldMutator:
     """Provide high-level helpers for mutating packet fields."""
 
     def __init__(self, strategies: Optional[Dict[type, FieldStrategy]] = None):
         self._strategies = strategies or DEFAULT_FIELD_STRATEGIES
+        # Field class -> resolved strategy, so the MRO walk runs once per class
+        self._resolved: Dict[type, Optional[FieldStrategy]] = {}
 
     def set_value(self, packet: Any, field_name: str, raw_value: Any) -> Any:
         field, strategy = self._resolve_strategy(packet, field_name, require_setter=True)
         assert strategy.setter is not None  # for mypy/static analyzers
         return strategy.setter(packet, field_name, raw_value)
 
+    def set_values(self, packet: Any, updates: Mapping[str, Any]) -> Dict[str, Any]:
+        """Apply several field updates to ``packet`` as one operation.
+
+        Every field is resolved before anything is written, and if a value is
+        rejected the fields already written are restored, so the packet is
+        either fully updated or left unchanged.
+        """
+
+        setters = []
+        for field_name, raw_value in updates.items():
+            _, strategy = self._resolve_strategy(packet, field_name, require_setter=True)
+            setters.append((field_name, strategy.setter, raw_value))
+
+        previous: Dict[str, Any] = {}
+        results: Dict[str, Any] = {}
+        try:
+            for field_name, setter, raw_value in setters:
+                previous.setdefault(field_name, getattr(packet, field_name))
+                results[field_name] = setter(packet, field_name, raw_value)
+        except FieldMutationError:
+            for field_name, value in previous.items():
+                setattr(packet, field_name, value)
+            raise
+        return results
+
     def clear_value(self, packet: Any, field_name: str) -> Any:
         field, strategy = self._resolve_strategy(packet, field_name, require_clearer=True)
         if strategy.clearer is None:
@@ -265,7 +335,7 @@ class FieldMutator:
         require_setter: bool = False,
         require_clearer: bool = False,
     ) -> Tuple[Any, FieldStrategy]:
-        field = getattr(packet.__class__, field_name, None)
+        field = packet_field(packet, field_name)
         if field is None:
             raise FieldMutationError(f"Field {field_name} not found.")
 
@@ -286,10 +356,12 @@ class FieldMutator:
         return field, strategy
 
     def _lookup_strategy(self, field: Any) -> Optional[FieldStrategy]:
-        for field_type, strategy in self._strategies.items():
-            if isinstance(field, field_type):
-                return strategy
-        return None
+        field_type = type(field)
+        try:
+            return self._resolved[field_type]
+        except KeyError:
+            strategy = self._resolved[field_type] = _strategy_for(self._strategies, field_type)
+            return strategy
 
 
 class FieldFormatter:
@@ -297,9 +369,11 @@ class FieldFormatter:
 
     def __init__(self, strategies: Optional[Dict[type, FieldStrategy]] = None):
         self._strategies = strategies or DEFAULT_FIELD_STRATEGIES
+        # Field class -> resolved strategy, so the MRO walk runs once per class
+        self._resolved: Dict[type, Optional[FieldStrategy]] = {}
 
     def format_value(self, packet: Any, field_name: str) -> Any:
-        field = getattr(packet.__class__, field_name, None)
+        field = packet_field(packet, field_name)
         if field is None:
             raise FieldFormattingError(f"Field {field_name} not found.")
 
@@ -311,10 +385,12 @@ class FieldFormatter:
         return strategy.formatter(packet, field_name)
 
     def _lookup_strategy(self, field: Any) -> Optional[FieldStrategy]:
-        for field_type, strategy in self._strategies.items():
-            if isinstance(field, field_type):
-                return strategy
-        return None
+        field_type = type(field)
+        try:
+            return self._resolved[field_type]
+        except KeyError:
+            strategy = self._resolved[field_type] = _strategy_for(self._strategies, field_type)
+            return strategy
 
 
 class WaveformManager:
@@ -434,7 +510,7 @@ class WaveformManager:
         packet = self._packet_supplier()
         if packet is None:
             raise WaveformError("Packet is not available for waveform generation.")
-        field = getattr(packet.__class__, field_name, None)
+        field = packet_field(packet, field_name)
         if field is None:
             raise WaveformError(f"Field {field_name} not found.")
         if not isinstance(field, scapy_all.IEEEFloatField):
@@ -480,4 +556,5 @@ __all__ = [
     "FieldMutator",
     "WaveformError",
     "WaveformManager",
+    "packet_field",
 ]
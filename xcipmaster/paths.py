@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def package_root() -> Path:
     """Return the root directory of the installed :mod:`xcipmaster` package."""
     return Path(__file__).resolve().parent
 
 
+@lru_cache(maxsize=None)
 def default_config_directory() -> Path:
     """Return the directory containing the bundled CIP configuration files."""
     return package_root() / "conf"